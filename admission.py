@@ -0,0 +1,188 @@
+"""
+Admission Module
+Cost-aware admission control: caps the audio being decoded and analysed
+at once, queues the excess and rejects requests once the queue is full
+"""
+
+import math
+import time
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Initial bytes per second of audio by container (AudioProcessor.sniff_container),
+# until decoded durations have been observed
+DEFAULT_BYTE_RATES = {
+    "wav": 32000.0,        # 16-bit mono at 16 kHz
+    "pcm_s16le": 32000.0,
+    "flac": 24000.0,       # Lossless 16-bit mono at 16 kHz
+}
+DEFAULT_BYTE_RATE = 16000.0  # 128 kbit/s compressed audio (mp3, ogg, other)
+
+
+class AdmissionRejected(Exception):
+    """The admission queue is full; retry after retry_after seconds"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Server is busy, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Admits requests by estimated cost, in seconds of audio
+
+    A request's cost is its byte size divided by the byte rate of its
+    container, learned from the durations of previously decoded files (and
+    capped at the longest duration the processor decodes). Requests run
+    while the admitted cost stays under max_in_flight_seconds; the rest
+    wait in FIFO order, and once the waiting cost would exceed
+    max_queued_seconds new requests are rejected with a Retry-After
+    estimated from recent throughput. Must be used from a single event loop.
+    """
+
+    def __init__(
+        self,
+        max_in_flight_seconds: float = 600.0,
+        max_queued_seconds: float = 2400.0,
+        max_cost: Optional[float] = None,
+        smoothing: float = 0.2
+    ):
+        """
+        Args:
+            max_in_flight_seconds: Audio admitted at once (a larger single request runs alone)
+            max_queued_seconds: Audio allowed to wait for admission
+            max_cost: Upper bound for one request's cost (e.g. the processor's max_duration)
+            smoothing: Weight of each new observation in the byte-rate estimates
+        """
+        self.max_in_flight_seconds = max_in_flight_seconds
+        self.max_queued_seconds = max_queued_seconds
+        self.max_cost = max_cost
+        self.smoothing = smoothing
+        self.byte_rates: Dict[str, float] = dict(DEFAULT_BYTE_RATES)
+        self._waiters: deque = deque()
+        self._completed: deque = deque()  # (finished_at, cost) over the last minute
+        self.in_flight = 0
+        self.in_flight_seconds = 0.0
+        self.queued_seconds = 0.0
+        self.admitted = 0
+        self.rejected = 0
+
+    def estimate(self, n_bytes: int, audio_format: Optional[str]) -> float:
+        """
+        Estimated seconds of audio in n_bytes of the given container
+
+        With audio_format None (not known yet) the lowest estimate over all
+        containers is returned, so early checks only reject what could not be
+        queued in any container.
+        """
+        if audio_format is None:
+            rate = max(DEFAULT_BYTE_RATE, *self.byte_rates.values())
+        else:
+            rate = self.byte_rates.get(audio_format, DEFAULT_BYTE_RATE)
+        cost = n_bytes / rate
+        return min(cost, self.max_cost) if self.max_cost is not None else cost
+
+    def observe(self, n_bytes: int, audio_format: str, duration: float):
+        """Refine the container's byte rate with the decoded duration of a file"""
+        if duration <= 0:
+            return
+        rate = self.byte_rates.get(audio_format, DEFAULT_BYTE_RATE)
+        self.byte_rates[audio_format] = (1 - self.smoothing) * rate + self.smoothing * n_bytes / duration
+
+    def check(self, cost: float):
+        """Raise AdmissionRejected if a request of this cost could be neither run nor queued now"""
+        if self._fits(cost) and not self._waiters:
+            return
+        if self.queued_seconds + cost > self.max_queued_seconds:
+            self.rejected += 1
+            retry_after = self.retry_after()
+            logger.warning(f"Rejecting request ({cost:.1f}s of audio), retry after {retry_after}s")
+            raise AdmissionRejected(retry_after)
+
+    @asynccontextmanager
+    async def admit(self, cost: float) -> AsyncIterator[None]:
+        """Hold cost seconds of capacity for the duration of the block, waiting for it if needed"""
+        self.check(cost)
+        if not self._fits(cost) or self._waiters:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append((waiter, cost))
+            self.queued_seconds += cost
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():  # Admitted just as the caller went away
+                    self._release(cost)
+                elif (waiter, cost) in self._waiters:  # Not yet dropped by _wake
+                    self._waiters.remove((waiter, cost))
+                    self.queued_seconds = self.queued_seconds - cost if self._waiters else 0.0
+                    self._wake()
+                raise
+        else:
+            self._acquire(cost)
+
+        try:
+            yield
+        finally:
+            self._release(cost)
+
+    def _fits(self, cost: float) -> bool:
+        return self.in_flight == 0 or self.in_flight_seconds + cost <= self.max_in_flight_seconds
+
+    def _acquire(self, cost: float):
+        self.in_flight += 1
+        self.in_flight_seconds += cost
+        self.admitted += 1
+
+    def _release(self, cost: float):
+        self.in_flight -= 1
+        self.in_flight_seconds = self.in_flight_seconds - cost if self.in_flight else 0.0
+        now = time.monotonic()
+        self._completed.append((now, cost))
+        while self._completed and self._completed[0][0] < now - 60:
+            self._completed.popleft()
+        self._wake()
+
+    def _wake(self):
+        """
+        Admit waiters in arrival order while the head of the queue fits
+
+        Waiters cancelled but not yet resumed (their futures are already
+        done) are dropped without acquiring capacity for them.
+        """
+        while self._waiters:
+            waiter, waiting_cost = self._waiters[0]
+            if not waiter.done() and not self._fits(waiting_cost):
+                break
+            self._waiters.popleft()
+            self.queued_seconds = self.queued_seconds - waiting_cost if self._waiters else 0.0
+            if waiter.done():
+                continue
+            self._acquire(waiting_cost)
+            waiter.set_result(None)
+
+    def retry_after(self) -> int:
+        """Seconds until the queued and running audio should have drained, from the last minute's throughput"""
+        if not self._completed:
+            return 1
+        span = max(time.monotonic() - self._completed[0][0], 1.0)
+        throughput = sum(cost for _, cost in self._completed) / span
+        return max(1, min(60, math.ceil((self.queued_seconds + self.in_flight_seconds) / throughput)))
+
+    def stats(self) -> Dict:
+        """Queue depth, in-flight work and admission counters"""
+        return {
+            "in_flight": self.in_flight,
+            "in_flight_seconds": round(self.in_flight_seconds, 1),
+            "max_in_flight_seconds": self.max_in_flight_seconds,
+            "queued": len(self._waiters),
+            "queued_seconds": round(self.queued_seconds, 1),
+            "max_queued_seconds": self.max_queued_seconds,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "byte_rates": {name: round(rate) for name, rate in self.byte_rates.items()}
+        }
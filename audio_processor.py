@@ -4,83 +4,814 @@ Handles audio file processing, decoding, and preprocessing
 """
 
 import io
+import os
+import inspect
+import struct
+import asyncio
+import subprocess
+import threading
 import numpy as np
-from pydub import AudioSegment
-from typing import Tuple
+from scipy import signal
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
 import logging
 
+try:
+    import soundfile
+except ImportError:  # Optional in-process decoder for FLAC/OGG (and MP3 with libsndfile >= 1.1)
+    soundfile = None
+
 logger = logging.getLogger(__name__)
 
+# ffmpeg executable used by the fallback decoder
+FFMPEG_BINARY = os.environ.get("FFMPEG_BINARY", "ffmpeg")
+
+
+class Decoder(NamedTuple):
+    """A named audio decoder and the magic-byte test that selects it"""
+    name: str
+    sniff: Callable[[bytes], bool]
+    decode: Callable[..., Tuple[np.ndarray, int]]
+    decode_async: Optional[Callable] = None  # Coroutine variant that does not block the event loop
+    decode_stream: Optional[Callable] = None  # Variant returning (iterator of sample blocks, sample_rate)
+
+
+# Decoders return (samples, sample_rate): samples are integer or float PCM shaped
+# (n_samples,) or (n_samples, channels). "ffmpeg" is the catch-all fallback and
+# is always tried last. Only decoders with decode_stream are used in streaming mode.
+DECODERS: Dict[str, Decoder] = {}
+FALLBACK_DECODER = "ffmpeg"
+
+
+def register_decoder(
+    name: str,
+    sniff: Callable[[bytes], bool],
+    decode_async: Optional[Callable] = None,
+    decode_stream: Optional[Callable] = None
+) -> Callable:
+    """Decorator registering a decoder, chosen when sniff(header_bytes) is true"""
+    def decorator(decode: Callable) -> Callable:
+        DECODERS[name] = Decoder(name, sniff, decode, decode_async, decode_stream)
+        return decode
+    return decorator
+
+
+def _is_wav(header: bytes) -> bool:
+    return header[:4] == b"RIFF" and header[8:12] == b"WAVE"
+
+
+def _is_mp3(header: bytes) -> bool:
+    return header[:3] == b"ID3" or (len(header) > 1 and header[0] == 0xFF and header[1] & 0xE0 == 0xE0)
+
+
+def _is_soundfile_format(header: bytes) -> bool:
+    return soundfile is not None and (header[:4] in (b"fLaC", b"OggS") or _is_mp3(header))
+
+
+# Containers told apart by magic bytes, whichever decoder ends up reading them
+_CONTAINERS = (
+    ("wav", _is_wav),
+    ("flac", lambda header: header[:4] == b"fLaC"),
+    ("ogg", lambda header: header[:4] == b"OggS"),
+    ("mp3", _is_mp3),
+)
+
+
+# WAV (format tag, bits per sample) -> little-endian sample dtype
+_WAV_DTYPES = {
+    (1, 8): np.dtype("u1"),
+    (1, 16): np.dtype("<i2"),
+    (1, 32): np.dtype("<i4"),
+    (3, 32): np.dtype("<f4"),
+    (3, 64): np.dtype("<f8"),
+}
+
+
+def _sliced(decode: Callable) -> Callable:
+    """
+    Streaming variant of an in-process decoder whose output is a view of the
+    input bytes: the decoded samples are handed out block by block
+    """
+    def decode_stream(audio_bytes: bytes, block_samples: int, **options) -> Tuple[Iterator[np.ndarray], int]:
+        samples, sample_rate = decode(audio_bytes, **options)
+        blocks = (samples[start:start + block_samples] for start in range(0, len(samples), block_samples))
+        return blocks, sample_rate
+    return decode_stream
+
+
+def _decode_wav(audio_bytes: bytes) -> Tuple[np.ndarray, int]:
+    """
+    Parse a RIFF/WAVE file in-process
+
+    Samples are a zero-copy np.frombuffer view of the data chunk
+    (24-bit PCM is the exception and is widened to int32).
+    """
+    fmt = None
+    position = 12
+    while position + 8 <= len(audio_bytes):
+        chunk_id = audio_bytes[position:position + 4]
+        chunk_size = struct.unpack_from("<I", audio_bytes, position + 4)[0]
+        body = position + 8
+        
+        if chunk_id == b"fmt ":
+            format_tag, channels, sample_rate, _, block_align, bits = struct.unpack_from("<HHIIHH", audio_bytes, body)
+            if format_tag == 0xFFFE and chunk_size >= 26:  # WAVE_FORMAT_EXTENSIBLE: real tag in the sub-format GUID
+                format_tag = struct.unpack_from("<H", audio_bytes, body + 24)[0]
+            fmt = (format_tag, channels, sample_rate, block_align, bits)
+        
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise ValueError("WAV data chunk precedes fmt chunk")
+            format_tag, channels, sample_rate, block_align, bits = fmt
+            # Streaming writers may leave the size unset; never read past the buffer
+            n_frames = min(chunk_size, len(audio_bytes) - body) // block_align
+            
+            if format_tag == 1 and bits == 24:
+                packed = np.frombuffer(audio_bytes, np.uint8, n_frames * channels * 3, body).reshape(-1, 3)
+                widened = np.zeros((len(packed), 4), dtype=np.uint8)
+                widened[:, 1:] = packed
+                samples = widened.view("<i4").reshape(n_frames, channels)
+            else:
+                dtype = _WAV_DTYPES.get((format_tag, bits))
+                if dtype is None:
+                    raise ValueError(f"Unsupported WAV encoding: format {format_tag}, {bits}-bit")
+                samples = np.frombuffer(audio_bytes, dtype, n_frames * channels, body).reshape(n_frames, channels)
+            
+            return samples, sample_rate
+        
+        position = body + chunk_size + (chunk_size & 1)
+    
+    raise ValueError("WAV file has no data chunk")
+
+
+register_decoder("wav", _is_wav, decode_stream=_sliced(_decode_wav))(_decode_wav)
+
+
+def _decode_pcm_s16le(audio_bytes: bytes, sample_rate: int = 16000, channels: int = 1) -> Tuple[np.ndarray, int]:
+    """Headerless signed 16-bit little-endian PCM (selected explicitly, never sniffed)"""
+    n_frames = len(audio_bytes) // (2 * channels)
+    samples = np.frombuffer(audio_bytes, "<i2", n_frames * channels).reshape(n_frames, channels)
+    return samples, sample_rate
+
+
+register_decoder("pcm_s16le", lambda header: False, decode_stream=_sliced(_decode_pcm_s16le))(_decode_pcm_s16le)
+
+
+@register_decoder("soundfile", _is_soundfile_format)
+def _decode_soundfile(audio_bytes: bytes) -> Tuple[np.ndarray, int]:
+    """FLAC/OGG (and MP3 where libsndfile supports it) decoded in-process by libsndfile"""
+    samples, sample_rate = soundfile.read(io.BytesIO(audio_bytes), dtype="int16", always_2d=True)
+    return samples, sample_rate
+
+
+def _ffmpeg_command(audio_bytes: bytes, target_sample_rate: int, source: str = "pipe:0") -> List[str]:
+    """ffmpeg invocation decoding stdin (or a file) straight to mono s16le PCM at the target rate on stdout"""
+    command = [FFMPEG_BINARY, "-hide_banner", "-loglevel", "error"]
+    if _is_mp3(bytes(audio_bytes[:4])):
+        command += ["-f", "mp3"]
+    return command + [
+        "-i", source,
+        "-ac", "1",
+        "-ar", str(target_sample_rate),
+        "-f", "s16le",
+        "-acodec", "pcm_s16le",
+        "pipe:1"
+    ]
+
+
+def _pcm_buffer(max_samples: Optional[int], input_size: int) -> np.ndarray:
+    """Preallocated int16 output buffer; one spare sample detects over-long input"""
+    if max_samples is None:
+        # No cap: 32 samples per input byte covers highly compressed (low-bitrate) input at 16 kHz
+        max_samples = 32 * input_size
+    return np.empty(max_samples + 1, dtype=np.int16)
+
+
+def _feed_stdin(stream, audio_bytes: bytes):
+    """Write the whole input to a subprocess pipe, then close it"""
+    try:
+        stream.write(audio_bytes)
+    except BrokenPipeError:  # ffmpeg stopped reading (error or output cap reached)
+        pass
+    finally:
+        try:
+            stream.close()
+        except BrokenPipeError:
+            pass
+
+
+async def _decode_ffmpeg_async(
+    audio_bytes: bytes,
+    target_sample_rate: int = 16000,
+    max_samples: Optional[int] = None
+) -> Tuple[np.ndarray, int]:
+    """Coroutine variant of the ffmpeg decoder using an asyncio subprocess, so the event loop keeps running"""
+    buffer = _pcm_buffer(max_samples, len(audio_bytes))
+    view = memoryview(buffer).cast("B")
+    
+    process = await asyncio.create_subprocess_exec(
+        *_ffmpeg_command(audio_bytes, target_sample_rate),
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    
+    async def feed():
+        try:
+            process.stdin.write(audio_bytes)
+            await process.stdin.drain()
+            process.stdin.close()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+    
+    writer = asyncio.ensure_future(feed())
+    
+    filled = 0
+    while filled < len(view):
+        chunk = await process.stdout.read(min(1 << 16, len(view) - filled))
+        if not chunk:
+            break
+        view[filled:filled + len(chunk)] = chunk
+        filled += len(chunk)
+    
+    if filled == len(view):
+        # Output cap reached: the clip is over the duration limit, stop decoding
+        process.kill()
+    stderr = await process.stderr.read()
+    await process.wait()
+    await writer
+    
+    if filled < len(view) and process.returncode != 0:
+        raise ValueError(f"ffmpeg exited with {process.returncode}: {stderr.decode(errors='replace').strip()}")
+    
+    return buffer[:filled // 2], target_sample_rate
+
+
+def _stream_ffmpeg_blocks(audio_source: Union[bytes, str], block_samples: int, target_sample_rate: int) -> Iterator[np.ndarray]:
+    """Run ffmpeg and yield its int16 output in blocks of block_samples as they arrive"""
+    if isinstance(audio_source, str):
+        command = _ffmpeg_command(b"", target_sample_rate, source=audio_source)
+        stdin = subprocess.DEVNULL
+    else:
+        command = _ffmpeg_command(audio_source, target_sample_rate)
+        stdin = subprocess.PIPE
+    
+    process = subprocess.Popen(command, stdin=stdin, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    writer = None
+    if stdin == subprocess.PIPE:
+        writer = threading.Thread(target=_feed_stdin, args=(process.stdin, audio_source), daemon=True)
+        writer.start()
+    
+    try:
+        while True:
+            block = np.empty(block_samples, dtype=np.int16)
+            view = memoryview(block).cast("B")
+            filled = 0
+            while filled < len(view):
+                count = process.stdout.readinto(view[filled:])
+                if not count:
+                    break
+                filled += count
+            if filled >= 2:
+                yield block[:filled // 2]
+            if filled < len(view):
+                break
+        
+        stderr = process.stderr.read()
+        process.wait()
+        if process.returncode != 0:
+            raise ValueError(f"ffmpeg exited with {process.returncode}: {stderr.decode(errors='replace').strip()}")
+    finally:
+        # Consumer stopped early (duration cap, error): do not leave ffmpeg running
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        if writer is not None:
+            writer.join()
+
+
+def _stream_ffmpeg(
+    audio_source: Union[bytes, str],
+    block_samples: int,
+    target_sample_rate: int = 16000,
+    max_samples: Optional[int] = None
+) -> Tuple[Iterator[np.ndarray], int]:
+    """
+    Streaming ffmpeg decode: fixed-size int16 blocks at the target rate,
+    read from the pipe while ffmpeg is still decoding (max_samples is
+    enforced by the consumer)
+    """
+    return _stream_ffmpeg_blocks(audio_source, block_samples, target_sample_rate), target_sample_rate
+
+
+@register_decoder(FALLBACK_DECODER, lambda header: True, decode_async=_decode_ffmpeg_async, decode_stream=_stream_ffmpeg)
+def _decode_ffmpeg(
+    audio_bytes: bytes,
+    target_sample_rate: int = 16000,
+    max_samples: Optional[int] = None
+) -> Tuple[np.ndarray, int]:
+    """
+    Any format ffmpeg understands, decoded in a single pass to mono s16le at
+    the target rate and read from the pipe straight into a preallocated buffer
+    """
+    buffer = _pcm_buffer(max_samples, len(audio_bytes))
+    view = memoryview(buffer).cast("B")
+    
+    process = subprocess.Popen(
+        _ffmpeg_command(audio_bytes, target_sample_rate),
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+    writer = threading.Thread(target=_feed_stdin, args=(process.stdin, audio_bytes), daemon=True)
+    writer.start()
+    
+    filled = 0
+    while filled < len(view):
+        count = process.stdout.readinto(view[filled:])
+        if not count:
+            break
+        filled += count
+    
+    if filled == len(view):
+        # Output cap reached: the clip is over the duration limit, stop decoding
+        process.kill()
+    stderr = process.stderr.read()
+    process.wait()
+    writer.join()
+    
+    if filled < len(view) and process.returncode != 0:
+        raise ValueError(f"ffmpeg exited with {process.returncode}: {stderr.decode(errors='replace').strip()}")
+    
+    return buffer[:filled // 2], target_sample_rate
+
 
 class AudioProcessor:
     """Class for processing audio files"""
     
-    def __init__(self):
-        """Initialize audio processor"""
+    def __init__(
+        self,
+        max_duration: Optional[float] = 300,
+        block_duration: float = 10.0,
+        vad: bool = True
+    ):
+        """
+        Initialize audio processor
+        
+        Args:
+            max_duration: Longest accepted clip in seconds (None = no cap).
+                Whole-clip processing holds the decoded clip in memory;
+                stream_audio does not, so streaming deployments can raise
+                or remove the cap.
+            block_duration: Seconds of audio per block in streaming mode
+            vad: Whether callers should trim non-speech with trim_silence
+                before detection
+        """
         self.target_sample_rate = 16000  # Standard for speech processing
-        self.max_duration = 300  # Maximum 5 minutes
+        self.max_duration = max_duration  # Default maximum 5 minutes
         self.min_duration = 0.5  # Minimum 0.5 seconds
+        self.block_duration = block_duration
+        
+        # Voice activity detection (energy + zero-crossing rate over short frames)
+        self.vad = vad
+        self.vad_frame_duration = 0.02  # 20 ms frames
+        self.vad_hangover = 0.2  # Speech kept on either side of detected frames (seconds)
+        self.vad_margin_db = 6.0  # Speech must exceed the noise floor by this much
+        self.vad_dynamic_range_db = 40.0  # ...and be within this much of the loudest frames
     
-    def process_audio(self, audio_bytes: bytes) -> Tuple[np.ndarray, int, float]:
+    def process_audio(
+        self,
+        audio_bytes: bytes,
+        audio_format: Optional[str] = None,
+        out: Optional[np.ndarray] = None,
+        **decoder_options
+    ) -> Tuple[np.ndarray, int, float]:
         """
         Process audio bytes to numpy array
         
         Args:
-            audio_bytes: Raw audio file bytes (MP3)
+            audio_bytes: Raw audio file bytes (MP3, WAV, FLAC, ...)
+            audio_format: Decoder name to use instead of sniffing magic bytes
+                (e.g. "pcm_s16le" for headerless PCM)
+            out: Optional float32 buffer to write the processed audio into
+                (audio_data is then a view of its first samples)
+            decoder_options: Extra options for the decoder (e.g. sample_rate for PCM)
             
         Returns:
             Tuple of (audio_data, sample_rate, duration_seconds)
         """
         try:
-            # Load audio using pydub
-            audio = AudioSegment.from_file(io.BytesIO(audio_bytes), format="mp3")
-            
-            # Get duration
-            duration = len(audio) / 1000.0  # Convert to seconds
-            
-            # Validate duration
-            if duration < self.min_duration:
-                raise ValueError(f"Audio too short: {duration:.2f}s (minimum: {self.min_duration}s)")
-            
-            if duration > self.max_duration:
-                raise ValueError(f"Audio too long: {duration:.2f}s (maximum: {self.max_duration}s)")
-            
-            # Convert to mono if stereo
-            if audio.channels > 1:
-                audio = audio.set_channels(1)
-                logger.info("Converted stereo to mono")
-            
-            # Resample to target sample rate if needed
-            if audio.frame_rate != self.target_sample_rate:
-                audio = audio.set_frame_rate(self.target_sample_rate)
-                logger.info(f"Resampled from {audio.frame_rate}Hz to {self.target_sample_rate}Hz")
-            
-            # Convert to numpy array
-            samples = np.array(audio.get_array_of_samples())
-            
-            # Normalize to [-1, 1]
-            audio_data = samples.astype(np.float32) / (2**15)
+            samples, native_rate = self._decode(audio_bytes, audio_format, **decoder_options)
+            return self._preprocess(samples, native_rate, out)
             
-            # Remove DC offset
-            audio_data = audio_data - np.mean(audio_data)
-            
-            # Apply pre-emphasis filter (typical for speech)
-            audio_data = self._apply_preemphasis(audio_data)
-            
-            logger.info(f"Processed audio: {duration:.2f}s, {self.target_sample_rate}Hz")
-            
-            return audio_data, self.target_sample_rate, duration
+        except Exception as e:
+            logger.error(f"Error processing audio: {str(e)}")
+            raise ValueError(f"Failed to process audio file: {str(e)}")
+    
+    async def process_audio_async(
+        self,
+        audio_bytes: bytes,
+        audio_format: Optional[str] = None,
+        out: Optional[np.ndarray] = None,
+        **decoder_options
+    ) -> Tuple[np.ndarray, int, float]:
+        """
+        Same as process_audio, but subprocess decoders (ffmpeg) run as asyncio
+        subprocesses so the event loop is not blocked while they decode
+        """
+        try:
+            samples, native_rate = await self._decode_async(audio_bytes, audio_format, **decoder_options)
+            return self._preprocess(samples, native_rate, out)
             
         except Exception as e:
             logger.error(f"Error processing audio: {str(e)}")
             raise ValueError(f"Failed to process audio file: {str(e)}")
     
-    def _apply_preemphasis(self, audio_data: np.ndarray, coef: float = 0.97) -> np.ndarray:
+    def stream_audio(
+        self,
+        audio_source: Union[bytes, str],
+        audio_format: Optional[str] = None,
+        **decoder_options
+    ) -> Iterator[np.ndarray]:
+        """
+        Decode audio as a stream of fixed-size, preprocessed 16 kHz mono float32 blocks
+        
+        Only one block is held at a time, so memory does not grow with the
+        duration of the recording. Blocks are block_duration seconds long
+        (the last one may be shorter).
+        
+        Args:
+            audio_source: Raw audio file bytes, or a path to an audio file
+                (paths are decoded by ffmpeg reading the file directly)
+            audio_format: Decoder name to use instead of sniffing magic bytes
+            decoder_options: Extra options for the decoder (e.g. sample_rate for PCM)
+            
+        Yields:
+            Preprocessed audio blocks; ValueError is raised if the stream
+            exceeds max_duration or ends below min_duration
+        """
+        blocks, native_rate = self._decode_stream(audio_source, audio_format, **decoder_options)
+        return self._preprocess_stream(blocks, native_rate)
+    
+    def _preprocess_stream(self, blocks: Iterator[np.ndarray], native_rate: int) -> Iterator[np.ndarray]:
+        """
+        Streaming counterpart of _preprocess (blocks are already at the target rate)
+        
+        Pre-emphasis carries the previous block's last sample across the
+        boundary. DC removal uses the running mean of the samples seen so far,
+        since the mean of the whole recording is not known until the end.
+        """
+        coef = 0.97
+        n_samples = 0
+        running_sum = 0.0
+        previous = None
+        max_samples = None if self.max_duration is None else int(self.max_duration * native_rate)
+        
+        try:
+            for samples in blocks:
+                block = self._to_mono_float(samples)
+                if not len(block):
+                    continue
+                n_samples += len(block)
+                if max_samples is not None and n_samples > max_samples:
+                    raise ValueError(f"Audio too long: exceeds the maximum of {self.max_duration}s")
+                
+                running_sum += float(np.sum(block, dtype=np.float64))
+                mean = running_sum / n_samples
+                
+                # (x[n] - m) - coef * (x[n-1] - m) == x[n] - coef * x[n-1] - (1 - coef) * m
+                emphasized = np.empty_like(block)
+                emphasized[1:] = block[1:] - coef * block[:-1]
+                emphasized[0] = block[0] if previous is None else block[0] - coef * previous
+                emphasized -= (1 - coef) * mean
+                if previous is None:
+                    emphasized[0] -= coef * mean  # First sample is only DC-corrected
+                previous = block[-1]
+                yield emphasized
+        finally:
+            close = getattr(blocks, "close", None)
+            if close is not None:
+                close()
+        
+        duration = n_samples / float(native_rate)
+        if duration < self.min_duration:
+            raise ValueError(f"Audio too short: {duration:.2f}s (minimum: {self.min_duration}s)")
+        logger.info(f"Streamed audio: {duration:.2f}s, {native_rate}Hz")
+    
+    def _preprocess(
+        self,
+        samples: np.ndarray,
+        native_rate: int,
+        out: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, int, float]:
+        """
+        Validate duration and turn decoded samples into normalized 16 kHz mono float32
+        
+        Conversion writes straight into one float32 buffer (out, if given) and
+        DC removal and pre-emphasis then run in place on it, so peak memory
+        stays close to the size of the output signal (resampling still needs
+        its own temporary).
+        """
+        # Get duration
+        duration = len(samples) / float(native_rate)
+        
+        # Validate duration
+        if duration < self.min_duration:
+            raise ValueError(f"Audio too short: {duration:.2f}s (minimum: {self.min_duration}s)")
+        
+        if self.max_duration is not None and duration > self.max_duration:
+            raise ValueError(f"Audio too long: {duration:.2f}s (maximum: {self.max_duration}s)")
+        
+        if native_rate == self.target_sample_rate:
+            # Normalize to [-1, 1] float32 mono, directly into the output buffer
+            audio_data = self._to_mono_float(samples, self._output_buffer(out, len(samples)))
+        else:
+            # Resample to target sample rate
+            audio_data = self._resample(self._to_mono_float(samples), native_rate, out)
+            logger.info(f"Resampled from {native_rate}Hz to {self.target_sample_rate}Hz")
+        
+        # Remove DC offset and apply pre-emphasis filter (typical for speech), fused and in place
+        self._apply_preemphasis(audio_data, mean=float(np.mean(audio_data, dtype=np.float64)))
+        
+        logger.info(f"Processed audio: {duration:.2f}s, {self.target_sample_rate}Hz")
+        
+        return audio_data, self.target_sample_rate, duration
+    
+    def _decoder_candidates(self, audio_bytes: bytes, audio_format: Optional[str] = None) -> List[Decoder]:
+        """
+        Decoders to try in order: sniffed by magic bytes (or named by
+        audio_format), with ffmpeg as the fallback
+        """
+        if audio_format is not None:
+            if audio_format not in DECODERS:
+                raise ValueError(f"Unknown audio format: {audio_format}")
+            return [DECODERS[audio_format]]
+        
+        header = bytes(audio_bytes[:16])
+        candidates = [
+            decoder for name, decoder in DECODERS.items()
+            if name != FALLBACK_DECODER and decoder.sniff(header)
+        ]
+        candidates.append(DECODERS[FALLBACK_DECODER])
+        return candidates
+    
+    def sniff_container(self, audio_bytes: bytes, audio_format: Optional[str] = None) -> str:
+        """
+        Container of audio_bytes from its magic bytes: "wav", "flac", "ogg",
+        "mp3", or for anything else audio_format (e.g. "pcm_s16le" for
+        headerless PCM) when given and "other" otherwise
+        """
+        if audio_format is not None and audio_format not in DECODERS:
+            raise ValueError(f"Unknown audio format: {audio_format}")
+        header = bytes(audio_bytes[:16])
+        for name, sniff in _CONTAINERS:
+            if sniff(header):
+                return name
+        return audio_format if audio_format not in (None, FALLBACK_DECODER) else "other"
+    
+    def check_decoder_options(self, audio_bytes: bytes, audio_format: Optional[str] = None, **options):
+        """
+        Raise ValueError unless every decoder that may be tried for
+        audio_bytes accepts the caller's decoder options
+        
+        Checked before decoding, so e.g. sample_rate sent with a WAV file is
+        reported as such instead of as a failed decoder call.
+        """
+        self._check_options(self._decoder_candidates(audio_bytes, audio_format), options)
+    
+    def _check_options(self, decoders: List[Decoder], options: Dict):
+        """Reject options one of decoders does not accept, naming the formats that do"""
+        for decoder in decoders:
+            accepted = self._accepted_options(decoder)
+            unsupported = [name for name in options if accepted is not None and name not in accepted]
+            if unsupported:
+                supporting = [
+                    other.name for other in DECODERS.values()
+                    if self._accepted_options(other) is None or set(unsupported) <= self._accepted_options(other)
+                ]
+                hint = f" (only with audio_format={' or '.join(supporting)})" if supporting else ""
+                raise ValueError(f"{', '.join(unsupported)} not supported by the {decoder.name} decoder{hint}")
+    
+    @staticmethod
+    def _accepted_options(decoder: Decoder) -> Optional[set]:
+        """Keyword options of a decoder's decode function (None = any); ffmpeg's own are set by the processor"""
+        parameters = list(inspect.signature(decoder.decode).parameters.values())[1:]
+        if any(parameter.kind == parameter.VAR_KEYWORD for parameter in parameters):
+            return None
+        accepted = {parameter.name for parameter in parameters}
+        if decoder.name == FALLBACK_DECODER:
+            accepted -= {"target_sample_rate", "max_samples"}
+        return accepted
+    
+    def _decoder_options(self, decoder: Decoder, options: Dict) -> Dict:
+        """Options for a decoder; ffmpeg resamples itself and stops at the duration cap"""
+        if decoder.name != FALLBACK_DECODER:
+            return options
+        return {
+            "target_sample_rate": self.target_sample_rate,
+            "max_samples": None if self.max_duration is None else int(self.max_duration * self.target_sample_rate),
+            **options
+        }
+    
+    def _decode(self, audio_bytes: bytes, audio_format: Optional[str] = None, **options) -> Tuple[np.ndarray, int]:
+        """Decode with the first decoder that succeeds"""
+        candidates = self._decoder_candidates(audio_bytes, audio_format)
+        self._check_options(candidates, options)
+        errors = []
+        for decoder in candidates:
+            try:
+                samples, sample_rate = decoder.decode(audio_bytes, **self._decoder_options(decoder, options))
+                logger.info(f"Decoded with {decoder.name} decoder")
+                return samples, sample_rate
+            except Exception as e:
+                logger.warning(f"{decoder.name} decoder failed: {str(e)}")
+                errors.append(f"{decoder.name}: {str(e)}")
+        
+        raise ValueError("; ".join(errors))
+    
+    async def _decode_async(self, audio_bytes: bytes, audio_format: Optional[str] = None, **options) -> Tuple[np.ndarray, int]:
+        """Decode with the first decoder that succeeds, awaiting async decoder variants"""
+        candidates = self._decoder_candidates(audio_bytes, audio_format)
+        self._check_options(candidates, options)
+        errors = []
+        for decoder in candidates:
+            try:
+                decoder_options = self._decoder_options(decoder, options)
+                if decoder.decode_async is not None:
+                    samples, sample_rate = await decoder.decode_async(audio_bytes, **decoder_options)
+                else:
+                    samples, sample_rate = decoder.decode(audio_bytes, **decoder_options)
+                logger.info(f"Decoded with {decoder.name} decoder")
+                return samples, sample_rate
+            except Exception as e:
+                logger.warning(f"{decoder.name} decoder failed: {str(e)}")
+                errors.append(f"{decoder.name}: {str(e)}")
+        
+        raise ValueError("; ".join(errors))
+    
+    def _decode_stream(
+        self,
+        audio_source: Union[bytes, str],
+        audio_format: Optional[str] = None,
+        **options
+    ) -> Tuple[Iterator[np.ndarray], int]:
+        """
+        Block iterator from the first streaming decoder that can produce the
+        target rate (in-process decoders at another rate defer to ffmpeg,
+        which resamples as it decodes)
+        """
+        block_samples = int(self.block_duration * self.target_sample_rate)
+        if isinstance(audio_source, str):
+            candidates = [DECODERS[audio_format or FALLBACK_DECODER]]
+        else:
+            candidates = self._decoder_candidates(audio_source, audio_format)
+        self._check_options([decoder for decoder in candidates if decoder.decode_stream is not None], options)
+        
+        errors = []
+        for decoder in candidates:
+            if decoder.decode_stream is None:
+                continue
+            try:
+                decoder_options = dict(self._decoder_options(decoder, options))
+                decoder_options.pop("max_samples", None)  # The cap is enforced while consuming blocks
+                blocks, sample_rate = decoder.decode_stream(audio_source, block_samples, **decoder_options)
+                if sample_rate != self.target_sample_rate:
+                    raise ValueError(f"streams at {sample_rate}Hz, not {self.target_sample_rate}Hz")
+                logger.info(f"Streaming with {decoder.name} decoder")
+                return blocks, sample_rate
+            except Exception as e:
+                logger.warning(f"{decoder.name} decoder failed: {str(e)}")
+                errors.append(f"{decoder.name}: {str(e)}")
+        
+        raise ValueError("; ".join(errors) or "No streaming decoder available")
+    
+    def _output_buffer(self, out: Optional[np.ndarray], n_samples: int) -> np.ndarray:
+        """First n_samples of the caller's float32 buffer, or a new one"""
+        if out is None:
+            return np.empty(n_samples, dtype=np.float32)
+        if out.dtype != np.float32 or out.ndim != 1 or len(out) < n_samples:
+            raise ValueError(f"Output buffer must be 1-D float32 with at least {n_samples} samples")
+        return out[:n_samples]
+    
+    def _to_mono_float(self, samples: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Down-mix to mono and scale integer PCM to float32 in [-1, 1], written into out"""
+        dtype = samples.dtype
+        if out is None:
+            out = np.empty(len(samples), dtype=np.float32)
+        
+        if samples.ndim == 2 and samples.shape[1] == 1:
+            samples = samples[:, 0]
+        
+        if samples.ndim == 2:
+            np.mean(samples, axis=1, dtype=np.float32, out=out)
+            logger.info("Converted stereo to mono")
+        else:
+            np.copyto(out, samples, casting="unsafe")
+        
+        if np.issubdtype(dtype, np.unsignedinteger):
+            # Unsigned PCM (8-bit WAV) is centred on the mid-scale value
+            midpoint = 2 ** (8 * dtype.itemsize - 1)
+            out -= midpoint
+            out /= midpoint
+        elif np.issubdtype(dtype, np.integer):
+            out /= 2 ** (8 * dtype.itemsize - 1)
+        
+        return out
+    
+    def _resample(self, audio_data: np.ndarray, sample_rate: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Polyphase resampling to the target sample rate, written into out"""
+        divisor = np.gcd(int(sample_rate), self.target_sample_rate)
+        up = self.target_sample_rate // divisor
+        down = int(sample_rate) // divisor
+        resampled = signal.resample_poly(audio_data, up, down)
+        if out is None and resampled.dtype == np.float32:
+            return resampled
+        target = self._output_buffer(out, len(resampled))
+        np.copyto(target, resampled, casting="same_kind")
+        return target
+    
+    def _apply_preemphasis(
+        self,
+        audio_data: np.ndarray,
+        coef: float = 0.97,
+        mean: float = 0.0,
+        block_size: int = 1 << 16
+    ) -> np.ndarray:
         """
         Apply pre-emphasis filter to boost high frequencies
         Common in speech processing
+        
+        Runs in place: y[n] = (x[n] - mean) - coef * (x[n-1] - mean), with
+        y[0] = x[0] - mean. Blocks are processed from the end so every block
+        still reads unfiltered samples; temporaries are one block in size.
         """
-        return np.append(audio_data[0], audio_data[1:] - coef * audio_data[:-1])
+        offset = (1 - coef) * mean
+        for stop in range(len(audio_data), 1, -block_size):
+            start = max(1, stop - block_size)
+            previous = audio_data[start - 1:stop - 1] * np.float32(coef)
+            previous += np.float32(offset)
+            audio_data[start:stop] -= previous
+        if len(audio_data):
+            audio_data[0] -= np.float32(mean)
+        return audio_data
+    
+    def trim_silence(self, audio_data: np.ndarray, sample_rate: int) -> Tuple[np.ndarray, float]:
+        """
+        Drop non-speech regions (leading/trailing dead air, pauses, gaps)
+        
+        Frames are speech when their energy clears an adaptive threshold
+        (noise floor + margin, but no lower than dynamic_range below the
+        peak), or when they are a little above the floor with a high
+        zero-crossing rate (unvoiced consonants). Speech is then extended
+        by the hangover so word edges survive. Kept regions are compacted
+        to the front of audio_data in place, and a view of them is returned.
+        Clips whose kept speech would be shorter than min_duration are
+        returned unchanged, with a speech_ratio of 1.0.
+        
+        Returns:
+            Tuple of (speech_audio, speech_ratio), where speech_ratio is
+            the fraction of the input that is returned (and analysed)
+        """
+        frame_length = max(1, int(sample_rate * self.vad_frame_duration))
+        n_frames = len(audio_data) // frame_length
+        if n_frames == 0:
+            return audio_data, 1.0
+        
+        frames = audio_data[:n_frames * frame_length].reshape(n_frames, frame_length)
+        energy_db = 10 * np.log10(np.einsum('ij,ij->i', frames, frames) / frame_length + 1e-12)
+        zcr = np.count_nonzero(np.diff(np.signbit(frames), axis=1), axis=1) / frame_length
+        
+        noise_floor, peak = np.percentile(energy_db, [10, 99])
+        if peak - noise_floor < self.vad_margin_db:
+            # No quiet regions to tell apart from speech
+            return audio_data, 1.0
+        
+        threshold = max(noise_floor + self.vad_margin_db, peak - self.vad_dynamic_range_db)
+        speech = (energy_db > threshold) | ((energy_db > noise_floor + self.vad_margin_db / 2) & (zcr > 0.25))
+        
+        hangover = int(round(self.vad_hangover / self.vad_frame_duration))
+        if hangover:
+            speech = np.convolve(speech, np.ones(2 * hangover + 1), mode="same") > 0
+        
+        # Samples after the last whole frame follow that frame's decision
+        runs = np.flatnonzero(np.diff(np.concatenate([[False], speech, [False]]).astype(np.int8)))
+        starts, stops = runs[::2] * frame_length, runs[1::2] * frame_length
+        if len(stops) and stops[-1] == n_frames * frame_length:
+            stops[-1] = len(audio_data)
+        
+        kept = int(np.sum(stops - starts))
+        if kept < self.min_duration * sample_rate:
+            # Too little speech to analyse on its own: the whole clip is kept
+            return audio_data, 1.0
+        speech_ratio = kept / len(audio_data)
+        
+        # Compact speech runs to the front (each run moves left, so nothing unread is overwritten)
+        position = 0
+        for start, stop in zip(starts, stops):
+            audio_data[position:position + stop - start] = audio_data[start:stop]
+            position += stop - start
+        
+        logger.info(f"Voice activity: kept {speech_ratio:.1%} of {len(audio_data) / sample_rate:.2f}s as speech")
+        return audio_data[:position], speech_ratio
     
     def validate_audio_quality(self, audio_data: np.ndarray, sample_rate: int) -> dict:
         """
@@ -0,0 +1,165 @@
+"""
+Batch Scheduler Module
+Micro-batching of concurrent requests: callers submit one item each and
+items that queue up behind busy workers are processed as one batch
+"""
+
+import math
+import time
+import asyncio
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatchScheduler:
+    """
+    Spreads submitted items over up to parallelism concurrent run_batch
+    calls and resolves each caller with its own result
+
+    While fewer than parallelism batches are running, queued items are
+    dispatched at the end of the loop iteration they were submitted in, so
+    a lone request does not wait and a burst is split over every worker
+    instead of landing on one. Items arriving while every slot is busy
+    queue up; each slot that frees takes an even share of the
+    queue (queued / parallelism items, at most max_batch_size), so the
+    backlog is spread over all workers rather than landing on the first
+    one to finish. With max_wait_ms above 0, items are also held until
+    max_batch_size have queued or the oldest has waited that long, trading
+    latency for larger batches.
+
+    run_batch receives a list of items and returns one result per item, in
+    order; a result that is an exception is raised to that caller only.
+    Must be used from a single event loop.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[List[Any]], Awaitable[Sequence[Any]]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 0.0,
+        parallelism: int = 1
+    ):
+        """
+        Args:
+            run_batch: Coroutine function processing a list of items
+            max_batch_size: Most items per batch
+            max_wait_ms: Longest an item is held for others while a slot is idle (0 = never)
+            parallelism: Batches run at once (e.g. the number of worker processes)
+        """
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max_wait_ms
+        self.parallelism = max(1, parallelism)
+        self._queue: List = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._dispatch_pending = False
+        self._tasks = set()
+        self.in_flight = 0
+        self.submitted = 0
+        self.batches = 0
+        self.total_wait_ms = 0.0
+        self.batch_sizes: Counter = Counter()
+
+    async def submit(self, item: Any) -> Any:
+        """Queue item for the next batch and wait for its result"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.append((item, future, time.monotonic()))
+        self.submitted += 1
+
+        # Dispatch once the current loop iteration is done, so items submitted together
+        # (e.g. the samples of one batch request) are split over the workers together
+        if not self._dispatch_pending:
+            self._dispatch_pending = True
+            loop.call_soon(self._dispatch_ready)
+        return await future
+
+    def _dispatch_ready(self):
+        """Start batches on the idle slots, each with an even share of the queue"""
+        self._dispatch_pending = False
+        # A share of the queue per worker, so the backlog is spread over every worker as it frees
+        share = min(self.max_batch_size, math.ceil(len(self._queue) / self.parallelism))
+        while self._queue and self.in_flight < self.parallelism:
+            if self._holding():
+                if self._timer is None:
+                    self._schedule_timer()
+                return
+            self._dispatch(share)
+
+        if not self._queue and self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _holding(self) -> bool:
+        """Whether the queue should wait for more items (max_wait_ms not yet reached)"""
+        if self.max_wait_ms <= 0 or len(self._queue) >= self.max_batch_size:
+            return False
+        return time.monotonic() - self._queue[0][2] < self.max_wait_ms / 1000
+
+    def _schedule_timer(self):
+        """Dispatch the queue once its oldest item has waited max_wait_ms"""
+        oldest = self._queue[0][2]
+        delay = max(0.0, oldest + self.max_wait_ms / 1000 - time.monotonic())
+        self._timer = asyncio.get_running_loop().call_later(delay, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        self._dispatch_ready()
+
+    def _dispatch(self, size: int):
+        """Start a batch with the first size queued items"""
+        batch, self._queue = self._queue[:size], self._queue[size:]
+
+        now = time.monotonic()
+        self.in_flight += 1
+        self.batches += 1
+        self.batch_sizes[len(batch)] += 1
+        self.total_wait_ms += sum(now - queued_at for _, _, queued_at in batch) * 1000
+
+        # Keep a reference so the task is not garbage collected while running
+        task = asyncio.ensure_future(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List):
+        try:
+            results = await self.run_batch([item for item, _, _ in batch])
+        except Exception as e:
+            logger.error(f"Batch of {len(batch)} failed: {str(e)}")
+            results = [e] * len(batch)
+        except BaseException:
+            # Cancelled (e.g. at shutdown): callers must not wait forever for results
+            for _, future, _ in batch:
+                if not future.done():
+                    future.cancel()
+            raise
+        finally:
+            self.in_flight -= 1
+            self._dispatch_ready()
+
+        for (_, future, _), result in zip(batch, results):
+            if future.done():  # Caller went away
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> Dict:
+        """Queue depth and batch-size counters"""
+        items = sum(size * count for size, count in self.batch_sizes.items())
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "parallelism": self.parallelism,
+            "queued": len(self._queue),
+            "in_flight_batches": self.in_flight,
+            "submitted": self.submitted,
+            "batches": self.batches,
+            "mean_batch_size": round(items / self.batches, 2) if self.batches else 0.0,
+            "mean_wait_ms": round(self.total_wait_ms / items, 2) if items else 0.0,
+            "batch_sizes": dict(sorted(self.batch_sizes.items()))
+        }
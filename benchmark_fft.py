@@ -0,0 +1,82 @@
+"""
+FFT Micro-Benchmark
+Compares spectrum latency at raw clip lengths against the FFT service
+(next_fast_len padding + worker threads) over random clip lengths
+"""
+
+import argparse
+import time
+import numpy as np
+from scipy.fft import rfft
+
+from fft_service import FFTService
+
+
+def time_call(fn, repeats=3):
+    """Best-of-N wall time of fn() in milliseconds"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def summarize(name, latencies):
+    """Print latency distribution"""
+    latencies = np.asarray(latencies)
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+    print(
+        f"{name:<28} p50={p50:8.2f}ms  p90={p90:8.2f}ms  "
+        f"p99={p99:8.2f}ms  max={latencies.max():8.2f}ms"
+    )
+
+
+def run_benchmark(n_clips=50, min_seconds=1.0, max_seconds=60.0, sample_rate=16000, workers=None, seed=0):
+    """
+    Time a whole-clip spectrum for random clip lengths
+
+    Args:
+        n_clips: Number of random clip lengths to test
+        min_seconds: Shortest clip duration
+        max_seconds: Longest clip duration
+        sample_rate: Sample rate in Hz
+        workers: Worker threads passed to the FFT service
+        seed: Random seed for clip lengths
+    """
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(int(min_seconds * sample_rate), int(max_seconds * sample_rate), n_clips)
+    service = FFTService(workers=workers)
+
+    before, after = [], []
+    for n_samples in lengths:
+        audio = rng.standard_normal(n_samples).astype(np.float32)
+        before.append(time_call(lambda: rfft(audio)))
+        after.append(time_call(lambda: service.rfft(audio)))
+
+    print(f"{n_clips} clips, {min_seconds:.0f}-{max_seconds:.0f}s at {sample_rate}Hz, workers={workers}")
+    summarize("raw length (before)", before)
+    summarize("next_fast_len (after)", after)
+
+    # Frame-batched transforms are where worker threads pay off
+    frames = rng.standard_normal((4096, 1024)).astype(np.float32)
+    single = FFTService(workers=1)
+    threaded = FFTService(workers=-1)
+    print(f"batched 4096x1024 frames:    workers=1 {time_call(lambda: single.rfft(frames, axis=1)):.2f}ms  "
+          f"workers=-1 {time_call(lambda: threaded.rfft(frames, axis=1)):.2f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="FFT latency micro-benchmark")
+    parser.add_argument("--clips", type=int, default=50, help="Number of random clip lengths")
+    parser.add_argument("--min-seconds", type=float, default=1.0, help="Shortest clip duration")
+    parser.add_argument("--max-seconds", type=float, default=60.0, help="Longest clip duration")
+    parser.add_argument("--workers", type=int, default=None, help="FFT worker threads (-1 = all CPUs)")
+    args = parser.parse_args()
+
+    run_benchmark(
+        n_clips=args.clips,
+        min_seconds=args.min_seconds,
+        max_seconds=args.max_seconds,
+        workers=args.workers
+    )
@@ -0,0 +1,174 @@
+"""
+Detection Worker Module
+CPU-bound decode and detection stages, run in worker processes so the
+API event loop only does I/O
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Sequence, Union
+import numpy as np
+import logging
+
+from voice_detector import ANALYSES, FEATURES, AnalysisNode, VoiceDetector
+from audio_processor import AudioProcessor
+
+logger = logging.getLogger(__name__)
+
+# Per-process instances, set by init_worker
+_detector: Optional[VoiceDetector] = None
+_processor: Optional[AudioProcessor] = None
+
+
+def init_worker(
+    detector: VoiceDetector,
+    processor: AudioProcessor,
+    features: Optional[Dict[str, AnalysisNode]] = None,
+    analyses: Optional[Dict[str, AnalysisNode]] = None,
+    log_level: int = logging.INFO
+):
+    """
+    Process pool initializer: keep the API's detector and processor
+    configuration and warm them up before the first request
+
+    features and analyses are the API process's registries. Spawned
+    workers only get the built-in registrations from importing
+    voice_detector, so custom ones are passed here (their functions are
+    pickled by reference and must be importable module-level functions).
+    A short noise clip then runs through every feature once, so the
+    mel/DCT tables and FFT plan caches exist before real requests arrive.
+    """
+    global _detector, _processor
+    logging.basicConfig(level=log_level, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    if analyses is not None:
+        ANALYSES.update(analyses)
+    if features is not None:
+        FEATURES.update(features)
+    _detector = detector
+    _processor = processor
+
+    sample_rate = processor.target_sample_rate
+    warmup = np.random.default_rng(0).standard_normal(sample_rate).astype(np.float32) * 0.1
+    _detector.detect(warmup, sample_rate, "english", include_features=True)
+
+
+class DetectionRequest(NamedTuple):
+    """One audio file to decode and detect, with its request options"""
+    audio_bytes: bytes
+    language: Optional[str]
+    include_features: bool
+    audio_format: Optional[str] = None
+    full_analysis: bool = False
+    decoder_options: Optional[Dict] = None
+
+
+def detect_audio_many(
+    requests: Sequence[DetectionRequest],
+    extract_features: bool = False
+) -> List[Union[Dict, Exception]]:
+    """
+    Decode several audio files and detect them as vectorized batches
+
+    Clips are grouped by include_features, so every result is identical to
+    detecting its clip on its own. A file that fails does not fail the others.
+
+    Returns:
+        One item per request: the entry {"result", "language", "duration",
+        "speech_ratio"}, or the exception that request raised. With
+        extract_features the full feature set is extracted (and scored with
+        the same early-exit rule) and returned under "stored" for the feature store
+    """
+    entries: List[Union[Dict, Exception]] = [None] * len(requests)
+    clips = {}
+    for idx, request in enumerate(requests):
+        try:
+            audio_data, sample_rate, duration = _processor.process_audio(
+                request.audio_bytes, request.audio_format, **(request.decoder_options or {})
+            )
+            audio_data, speech_ratio = _trim_silence(audio_data, sample_rate)
+
+            # Detect language if not provided
+            language = request.language
+            if language is None:
+                language = _detector.detect_language(audio_data, sample_rate)
+                logger.info(f"Language auto-detected: {language}")
+        except Exception as e:
+            entries[idx] = e
+            continue
+
+        clips[idx] = audio_data
+        entries[idx] = {"language": language, "duration": duration, "speech_ratio": speech_ratio}
+
+    sample_rate = _processor.target_sample_rate
+    for include_features in (False, True):
+        group = [idx for idx in clips if requests[idx].include_features == include_features]
+        if not group:
+            continue
+
+        if extract_features:
+            # Full features are needed for the store, so each clip is extracted on its own
+            for idx in group:
+                entry = entries[idx]
+                try:
+                    entries[idx] = _extract_entry(
+                        clips[idx], sample_rate, entry["duration"], entry["speech_ratio"],
+                        entry["language"], include_features, requests[idx].full_analysis
+                    )
+                except Exception as e:
+                    entries[idx] = e
+            continue
+
+        try:
+            detections = _detector.detect_many(
+                audio_clips=[clips[idx] for idx in group],
+                sample_rate=sample_rate,
+                languages=[entries[idx]["language"] for idx in group],
+                include_features=include_features,
+                full_analysis=[requests[idx].full_analysis for idx in group]
+            )
+        except Exception as e:
+            for idx in group:
+                entries[idx] = e
+            continue
+
+        for idx, result in zip(group, detections):
+            entries[idx]["result"] = result
+    return entries
+
+
+def _trim_silence(audio_data: np.ndarray, sample_rate: int):
+    """Voice-activity stage between decoding and detection; speech_ratio is None when disabled"""
+    if not _processor.vad:
+        return audio_data, None
+    return _processor.trim_silence(audio_data, sample_rate)
+
+
+def _extract_entry(
+    audio_data: np.ndarray,
+    sample_rate: int,
+    duration: float,
+    speech_ratio: Optional[float],
+    language: str,
+    include_features: bool,
+    full_analysis: bool
+) -> Dict:
+    """Extract every feature, keeping them for the feature store, and score them as detect() would"""
+    stored_language = _detector.detect_language(audio_data, sample_rate)
+    coverage = 1.0
+    if not full_analysis:
+        audio_data, coverage = _detector.sample_segments(audio_data, sample_rate)
+    analyzed_duration = round(len(audio_data) / sample_rate, 2)
+
+    features = _detector.extract_features(audio_data, sample_rate)
+    result = _detector.detect_from_features(features, language, include_features)
+    result.update(coverage=round(coverage, 4), analyzed_duration_seconds=analyzed_duration)
+    return {
+        "result": result,
+        "language": language,
+        "duration": duration,
+        "speech_ratio": speech_ratio,
+        "stored": {
+            "features": features,
+            "language": stored_language,
+            "coverage": round(coverage, 4),
+            "analyzed_duration": analyzed_duration
+        }
+    }
@@ -0,0 +1,152 @@
+"""
+Feature Store Module
+Persistent SQLite store mapping audio hashes to extracted features,
+so previously seen clips can be re-scored without decoding
+"""
+
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class FeatureStore:
+    """
+    On-disk map of audio hash -> {"features", "duration", "language", "speech_ratio",
+    "coverage", "analyzed_duration"}
+
+    Features are the full dict from feature extraction, independent of
+    thresholds and scoring weights, so stored clips can be re-scored after
+    a threshold change. Reads go through an in-memory index that can be
+    bulk warm-loaded at startup. Safe to share between threads.
+    """
+
+    def __init__(self, path: str = "logs/features.db"):
+        """
+        Args:
+            path: SQLite database file (created with its directory if missing)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS features ("
+            "audio_hash TEXT PRIMARY KEY, "
+            "features TEXT NOT NULL, "
+            "duration REAL NOT NULL, "
+            "language TEXT, "
+            "created_at REAL NOT NULL)"
+        )
+        # Columns added after the first release; older stores are migrated in place
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(features)")}
+        for column in ("speech_ratio", "coverage", "analyzed_duration"):
+            if column not in columns:
+                self._connection.execute(f"ALTER TABLE features ADD COLUMN {column} REAL")
+        self._connection.commit()
+        self._memory: Dict[str, Dict] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(audio_bytes: bytes, **options) -> str:
+        """SHA-256 of the audio bytes plus any decoder options"""
+        digest = hashlib.sha256(audio_bytes)
+        if options:
+            digest.update(json.dumps(options, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def get(self, audio_hash: str) -> Optional[Dict]:
+        """Stored record for audio_hash, or None"""
+        with self._lock:
+            record = self._memory.get(audio_hash)
+            if record is None:
+                row = self._connection.execute(
+                    "SELECT features, duration, language, speech_ratio, coverage, analyzed_duration "
+                    "FROM features WHERE audio_hash = ?",
+                    (audio_hash,)
+                ).fetchone()
+                if row is not None:
+                    record = self._record(row)
+                    self._memory[audio_hash] = record
+
+            if record is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return dict(record, features=dict(record["features"]))
+
+    def put(
+        self,
+        audio_hash: str,
+        features: Dict,
+        duration: float,
+        language: Optional[str] = None,
+        speech_ratio: Optional[float] = None,
+        coverage: Optional[float] = None,
+        analyzed_duration: Optional[float] = None
+    ):
+        """Store (or replace) the features of a clip"""
+        features = {name: float(value) for name, value in features.items()}
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO features "
+                "(audio_hash, features, duration, language, speech_ratio, coverage, analyzed_duration, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    audio_hash, json.dumps(features), float(duration), language,
+                    speech_ratio, coverage, analyzed_duration, time.time()
+                )
+            )
+            self._connection.commit()
+            self._memory[audio_hash] = {
+                "features": features, "duration": float(duration), "language": language,
+                "speech_ratio": speech_ratio, "coverage": coverage, "analyzed_duration": analyzed_duration
+            }
+
+    def warm_load(self) -> int:
+        """Bulk-load every stored record into memory; returns the number loaded"""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT audio_hash, features, duration, language, speech_ratio, coverage, analyzed_duration FROM features"
+            ).fetchall()
+            for audio_hash, *row in rows:
+                self._memory[audio_hash] = self._record(row)
+        logger.info(f"Feature store warm-loaded {len(rows)} clips from {self.path}")
+        return len(rows)
+
+    @staticmethod
+    def _record(row) -> Dict:
+        features, duration, language, speech_ratio, coverage, analyzed_duration = row
+        return {
+            "features": json.loads(features), "duration": duration, "language": language,
+            "speech_ratio": speech_ratio, "coverage": coverage, "analyzed_duration": analyzed_duration
+        }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM features").fetchone()[0]
+
+    def stats(self) -> Dict:
+        """Stored and in-memory record counts with hit/miss counters"""
+        stored = len(self)
+        with self._lock:
+            return {
+                "path": str(self.path),
+                "stored": stored,
+                "in_memory": len(self._memory),
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,63 @@
+"""
+FFT Service Module
+Real FFTs at fast transform lengths with configurable worker threads,
+plus cached window arrays shared across requests
+"""
+
+import numpy as np
+from typing import Optional
+from functools import lru_cache
+from scipy import fft as sp_fft
+from scipy import signal
+
+
+@lru_cache(maxsize=16)
+def _hann_window(length: int, dtype: np.dtype) -> np.ndarray:
+    """Periodic Hann window"""
+    window = signal.get_window('hann', length).astype(dtype)
+    window.flags.writeable = False
+    return window
+
+
+class FFTService:
+    """
+    Wrapper around scipy.fft used by every transform in feature extraction
+
+    Transforms are zero-padded to scipy.fft.next_fast_len, so prime or
+    awkward clip lengths never hit slow FFT paths. Whole-clip padded
+    lengths still vary almost as much as the clip lengths themselves, so
+    only frame-length windows, whose lengths come from the configuration,
+    are cached.
+    workers is passed straight to scipy.fft. It speeds up batched
+    transforms over many frames, not single 1-D transforms.
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        """
+        Args:
+            workers: Worker threads per transform (None = scipy default of 1,
+                -1 = all CPUs)
+        """
+        self.workers = workers
+
+    @staticmethod
+    def fast_length(n: int) -> int:
+        """Smallest fast real-FFT length >= n"""
+        return sp_fft.next_fast_len(max(int(n), 1), real=True)
+
+    def rfft(self, data: np.ndarray, n: Optional[int] = None, axis: int = -1) -> np.ndarray:
+        """Real FFT along axis, zero-padded to a fast length of at least n samples"""
+        n_fft = self.fast_length(data.shape[axis] if n is None else n)
+        return sp_fft.rfft(data, n_fft, axis=axis, workers=self.workers)
+
+    def irfft(self, spectrum: np.ndarray, n: int, axis: int = -1) -> np.ndarray:
+        """Inverse real FFT of an n-point transform (n as used for the forward rfft)"""
+        return sp_fft.irfft(spectrum, n, axis=axis, workers=self.workers)
+
+    def window(self, length: int, dtype: np.dtype = np.float32) -> np.ndarray:
+        """Cached periodic Hann window"""
+        return _hann_window(length, np.dtype(dtype))
+
+
+# Shared single-threaded instance used when no service is passed explicitly
+default_fft = FFTService()
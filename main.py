@@ -3,19 +3,32 @@ Voice Detection API - Main Application
 Detects AI-generated vs Human-generated voice samples in multiple languages
 """
 
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, HTTPException, Header, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field, validator
-from typing import Literal, Optional, Dict, List
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
+from typing import Literal, Optional, Dict, List, Union
 import base64
 import io
+import json
+import asyncio
+import functools
 import logging
+import multiprocessing
 from datetime import datetime
 import uvicorn
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 # Import detection modules
-from voice_detector import VoiceDetector
+from voice_detector import ANALYSES, FEATURES, VoiceDetector
 from audio_processor import AudioProcessor
+from result_cache import ResultCache
+from feature_store import FeatureStore
+from batch_scheduler import MicroBatchScheduler
+from admission import AdmissionController, AdmissionRejected
+import detection_worker
 
 # Configure logging
 logging.basicConfig(
@@ -41,15 +54,153 @@ app.add_middleware(
 )
 
 # Initialize detector and processor
-detector = VoiceDetector()
+# Long clips are analyzed through representative segments totalling ANALYSIS_BUDGET_SECONDS (0 = whole clip)
+analysis_budget = float(os.environ.get("ANALYSIS_BUDGET_SECONDS", "30"))
+detector = VoiceDetector(
+    analysis_budget=analysis_budget or None,
+    analysis_segments=int(os.environ.get("ANALYSIS_SEGMENTS", "6"))
+)
 audio_processor = AudioProcessor()
 
+# Results of recently seen clips (retries, fan-out to several reviewers)
+result_cache = ResultCache(
+    max_bytes=int(float(os.environ.get("RESULT_CACHE_MAX_MB", "64")) * 1024 * 1024),
+    ttl_seconds=float(os.environ.get("RESULT_CACHE_TTL_SECONDS", "3600"))
+)
+
+# Optional on-disk feature store that survives restarts (e.g. FEATURE_STORE_PATH=logs/features.db)
+feature_store = FeatureStore(os.environ["FEATURE_STORE_PATH"]) if os.environ.get("FEATURE_STORE_PATH") else None
+
+
+# CPU-bound decoding and detection run in worker processes, each with its own copy of the
+# detector and processor, so the event loop only does I/O (DETECTION_WORKERS=0 uses a thread instead)
+detection_workers = int(os.environ.get("DETECTION_WORKERS", os.cpu_count() or 1))
+
+
+def _create_detection_pool() -> ProcessPoolExecutor:
+    """Worker processes with copies of the detector, processor and feature registries"""
+    return ProcessPoolExecutor(
+        max_workers=detection_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=detection_worker.init_worker,
+        initargs=(detector, audio_processor, dict(FEATURES), dict(ANALYSES))
+    )
+
+
+if detection_workers > 0:
+    detection_pool = _create_detection_pool()
+else:
+    detection_pool = None
+    detection_worker.init_worker(detector, audio_processor)
+
+# Batch limits: samples per request
+batch_max_items = int(os.environ.get("BATCH_MAX_ITEMS", "100"))
+batch_stream_max_items = int(os.environ.get("BATCH_STREAM_MAX_ITEMS", "1000"))
+
+
+async def _run_detection(fn, *args, **kwargs):
+    """Run a detection_worker function off the event loop, in the process pool (or a thread when disabled)"""
+    loop = asyncio.get_running_loop()
+    call = functools.partial(fn, *args, **kwargs)
+    pool = _ensure_detection_pool()
+    try:
+        future = loop.run_in_executor(pool, call)
+    except BrokenProcessPool:
+        # The pool broke before this request reached it, so nothing ran: retry once on a new pool
+        pool = _ensure_detection_pool()
+        future = loop.run_in_executor(pool, call)
+    try:
+        return await future
+    except BrokenProcessPool:
+        _replace_detection_pool(pool)
+        raise RuntimeError("A detection worker process died; the worker pool has been restarted")
+
+
+def _ensure_detection_pool() -> Optional[ProcessPoolExecutor]:
+    """The detection pool, replaced first if a worker died since it was last used"""
+    if _detection_pool_broken():
+        _replace_detection_pool(detection_pool)
+    return detection_pool
+
+
+def _replace_detection_pool(broken: ProcessPoolExecutor):
+    """Swap a broken pool (a worker died, e.g. killed for memory) for a new one, once per breakage"""
+    global detection_pool
+    if detection_pool is not broken:
+        return  # Already replaced by a concurrent request
+    logger.error("Detection pool is broken (a worker process died), starting a new one")
+    broken.shutdown(wait=False, cancel_futures=True)
+    detection_pool = _create_detection_pool()
+
+
+def _detection_pool_broken() -> bool:
+    """Whether the process pool has lost a worker and cannot run detections until it is replaced"""
+    return bool(getattr(detection_pool, "_broken", False))
+
+
+async def _run_detection_batch(requests: List[detection_worker.DetectionRequest]) -> List:
+    """Decode and detect a micro-batch of requests in one worker call"""
+    return await _run_detection(detection_worker.detect_audio_many, requests, feature_store is not None)
+
+
+# Detections go straight to idle workers; those queued behind busy workers are run through the
+# detector as vectorized batches of up to MICROBATCH_MAX_SIZE (1 disables), split evenly over the
+# workers. MICROBATCH_MAX_WAIT_MS > 0 also holds requests for larger batches while workers are idle
+detection_scheduler = MicroBatchScheduler(
+    _run_detection_batch,
+    max_batch_size=int(os.environ.get("MICROBATCH_MAX_SIZE", "8")),
+    max_wait_ms=float(os.environ.get("MICROBATCH_MAX_WAIT_MS", "0")),
+    parallelism=max(detection_workers, 1)
+)
+
+# Samples of one batch in flight at a time: enough to queue a full micro-batch for every worker,
+# so batch samples are amortized through detect_many instead of each running alone
+batch_concurrency = int(os.environ.get(
+    "BATCH_CONCURRENCY", max(detection_workers, 1) * detection_scheduler.max_batch_size
+))
+
+# Admission control by estimated seconds of audio: ADMISSION_MAX_IN_FLIGHT_SECONDS are decoded and
+# analyzed at once, up to ADMISSION_MAX_QUEUED_SECONDS wait, and requests beyond that get 429
+admission_max_in_flight = float(os.environ.get("ADMISSION_MAX_IN_FLIGHT_SECONDS", 300 * max(detection_workers, 1)))
+admission = AdmissionController(
+    max_in_flight_seconds=admission_max_in_flight,
+    max_queued_seconds=float(os.environ.get("ADMISSION_MAX_QUEUED_SECONDS", 4 * admission_max_in_flight)),
+    max_cost=audio_processor.max_duration
+)
+
+
+@app.on_event("startup")
+async def start_detection_pool():
+    """Start the worker processes (and their warm-up) before serving requests"""
+    if detection_pool is not None:
+        # One call per worker: with spawn, workers are only started as calls are submitted
+        loop = asyncio.get_running_loop()
+        pids = await asyncio.gather(*(loop.run_in_executor(detection_pool, os.getpid) for _ in range(detection_workers)))
+        logger.info(f"Detection pool started with {detection_workers} workers ({len(set(pids))} warmed up so far)")
+
+
+@app.on_event("shutdown")
+async def stop_detection_pool():
+    """Stop the worker processes"""
+    if detection_pool is not None:
+        detection_pool.shutdown(cancel_futures=True)
+
+
+@app.on_event("startup")
+async def warm_load_feature_store():
+    """Bulk-load stored features into memory before serving requests"""
+    if feature_store is not None and os.environ.get("FEATURE_STORE_WARM_LOAD", "1") == "1":
+        feature_store.warm_load()
+
 
 # Request/Response Models
-class VoiceDetectionRequest(BaseModel):
-    """Request model for voice detection"""
+Language = Literal["tamil", "english", "hindi", "malayalam", "telugu"]
+
+
+class AudioSample(BaseModel):
+    """A base64-encoded audio sample and its detection options, decoded on demand"""
     audio_data: str = Field(..., description="Base64-encoded MP3 audio file")
-    language: Optional[Literal["tamil", "english", "hindi", "malayalam", "telugu"]] = Field(
+    language: Optional[Language] = Field(
         None, 
         description="Language of the audio sample (optional, will be auto-detected if not provided)"
     )
@@ -57,26 +208,66 @@ class VoiceDetectionRequest(BaseModel):
         False, 
         description="Include detailed audio features in response"
     )
+    full_analysis: bool = Field(
+        False,
+        description="Analyze the whole clip even if it is longer than the analysis budget"
+    )
     
-    @validator('audio_data')
-    def validate_base64(cls, v):
-        """Validate that the audio_data is valid base64"""
-        try:
-            base64.b64decode(v)
-            return v
-        except Exception:
-            raise ValueError("Invalid base64 encoding")
+    _audio_bytes: Optional[bytes] = PrivateAttr(default=None)
+    
+    def decode_audio(self) -> bytes:
+        """
+        Decoded audio file bytes, raising ValueError for invalid base64; only
+        the bytes are kept, so the payload is decoded once and not held twice
+        """
+        if self._audio_bytes is None:
+            try:
+                self._audio_bytes = base64.b64decode(self.audio_data)
+            except Exception:
+                raise ValueError("Invalid base64 encoding")
+            self.audio_data = ""
+        return self._audio_bytes
+    
+    @property
+    def audio_bytes(self) -> bytes:
+        """Decoded audio file bytes"""
+        return self.decode_audio()
+
+
+class VoiceDetectionRequest(AudioSample):
+    """Request model for voice detection"""
+    
+    @model_validator(mode="after")
+    def decode_base64(self):
+        """Validate audio_data by decoding it during request validation"""
+        self.decode_audio()
+        return self
 
 
 class VoiceDetectionResponse(BaseModel):
     """Response model for voice detection"""
     classification: Literal["ai_generated", "human_generated"]
     confidence_score: float = Field(..., ge=0.0, le=1.0, description="Confidence score between 0 and 1")
+    confidence_is_estimate: bool = Field(
+        False,
+        description="Whether scoring stopped early, making confidence_score the midpoint of the still reachable range"
+    )
     explanation: str
     language_detected: str
     processing_time_ms: float
     audio_duration_seconds: float
     detailed_analysis: Optional[Dict] = None
+    skipped_features: Optional[List[str]] = Field(
+        None,
+        description="Features not computed because the verdict could no longer change"
+    )
+    cached: bool = Field(False, description="Whether the result was served from the result cache")
+    coverage: Optional[float] = Field(
+        None, ge=0.0, le=1.0, description="Fraction of the (speech-trimmed) clip that was analyzed"
+    )
+    analyzed_duration_seconds: Optional[float] = Field(
+        None, description="Seconds of audio analyzed; below the clip length when the analysis budget applies"
+    )
     timestamp: str
 
 
@@ -85,18 +276,44 @@ class HealthResponse(BaseModel):
     status: str
     version: str
     supported_languages: List[str]
+    admission: Optional[Dict] = None
     timestamp: str
 
 
 class BatchDetectionRequest(BaseModel):
-    """Request model for batch detection"""
-    samples: List[VoiceDetectionRequest] = Field(..., max_items=10)
+    """
+    Request model for batch detection
+    
+    Samples are decoded one by one during detection, so a sample with
+    invalid base64 fails on its own instead of failing the whole batch
+    """
+    samples: List[AudioSample] = Field(..., max_items=batch_max_items)
+
+
+class StreamingBatchDetectionRequest(BaseModel):
+    """Request model for streaming batch detection (samples are decoded as for BatchDetectionRequest)"""
+    samples: List[AudioSample] = Field(..., max_items=batch_stream_max_items)
+
+
+class BatchItemResult(VoiceDetectionResponse):
+    """A batch sample's detection result, with its position in the request"""
+    index: int
+
+
+class BatchItemError(BaseModel):
+    """A batch sample that failed, in place of its detection result"""
+    index: int
+    status_code: int
+    error: str
+    retry_after: Optional[int] = None
 
 
 class BatchDetectionResponse(BaseModel):
     """Response model for batch detection"""
-    results: List[VoiceDetectionResponse]
+    results: List[Union[BatchItemResult, BatchItemError]]
     total_samples: int
+    succeeded: int
+    failed: int
     processing_time_ms: float
 
 
@@ -113,14 +330,129 @@ async def root():
 
 
 @app.get("/health", response_model=HealthResponse)
-async def health_check():
-    """Health check endpoint"""
+async def health_check(response: Response):
+    """Health check endpoint; 503 if the detection pool was broken, which is then restarted"""
+    healthy = not _detection_pool_broken()
+    _ensure_detection_pool()
+    if not healthy:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
     return {
-        "status": "healthy",
+        "status": "healthy" if healthy else "unhealthy",
         "version": "1.0.0",
         "supported_languages": ["tamil", "english", "hindi", "malayalam", "telugu"],
+        "admission": admission.stats(),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+async def _detect_audio_bytes(
+    audio_bytes: bytes,
+    language: Optional[str],
+    include_features: bool,
+    start_time: datetime,
+    audio_format: Optional[str] = None,
+    full_analysis: bool = False,
+    **decoder_options
+) -> Dict:
+    """Decode, analyze and build the detection response for one audio file (or serve it from cache)"""
+    key_options = dict(decoder_options, audio_format=audio_format) if audio_format else dict(decoder_options)
+    key_options.update(_analysis_options(full_analysis))
+    cache_key = result_cache.key(audio_bytes, language, include_features, **key_options)
+    entry = result_cache.get(cache_key)
+    cached = entry is not None
+    
+    if entry is None:
+        # Previously seen clips are re-scored from stored features without decoding
+        entry = _stored_entry(audio_bytes, language, include_features, **key_options)
+        if entry is not None:
+            result_cache.put(cache_key, entry)
+    
+    if entry is None:
+        # Decode and detect in a worker process, batched with concurrent requests, once admitted;
+        # with the store enabled every feature is extracted
+        container = audio_processor.sniff_container(audio_bytes, audio_format)
+        async with admission.admit(admission.estimate(len(audio_bytes), container)):
+            entry = await detection_scheduler.submit(detection_worker.DetectionRequest(
+                audio_bytes, language, include_features, audio_format, full_analysis, decoder_options
+            ))
+        admission.observe(len(audio_bytes), container, entry["duration"])
+        _persist_features(audio_bytes, entry, **key_options)
+        result_cache.put(cache_key, entry)
+    
+    if cached:
+        logger.info("Serving detection result from cache")
+    
+    # Calculate processing time
+    processing_time = (datetime.now() - start_time).total_seconds() * 1000
+    
+    response = _build_response(entry, include_features, processing_time, cached)
+    logger.info(f"Detection completed: {response['classification']} ({response['confidence_score']:.2f})")
+    return response
+
+
+def _analysis_options(full_analysis: bool) -> Dict:
+    """Cache and feature store key options for the analysis budget (budgeted results are the default)"""
+    return {"full_analysis": True} if full_analysis else {}
+
+
+def _stored_entry(audio_bytes: bytes, language: Optional[str], include_features: bool, **key_options) -> Optional[Dict]:
+    """Detection entry re-scored from the feature store, or None if the clip is not stored"""
+    if feature_store is None:
+        return None
+    stored = feature_store.get(feature_store.key(audio_bytes, **key_options))
+    if stored is None:
+        return None
+    
+    logger.info("Re-scoring stored features")
+    language = language or stored["language"]
+    result = detector.detect_from_features(stored["features"], language, include_features)
+    result.update(coverage=stored["coverage"], analyzed_duration_seconds=stored["analyzed_duration"])
+    return {"result": result, "language": language, "duration": stored["duration"], "speech_ratio": stored["speech_ratio"]}
+
+
+def _persist_features(audio_bytes: bytes, entry: Dict, **key_options):
+    """Move the features a worker extracted for the store out of the entry and into the feature store"""
+    stored = entry.pop("stored", None)
+    if stored is None:
+        return
+    feature_store.put(
+        feature_store.key(audio_bytes, **key_options),
+        stored["features"],
+        entry["duration"],
+        stored["language"],
+        entry["speech_ratio"],
+        stored["coverage"],
+        stored["analyzed_duration"]
+    )
+
+
+def _build_response(entry: Dict, include_features: bool, processing_time: float, cached: bool) -> Dict:
+    """Detection response from a {"result", "language", "duration", "speech_ratio"} entry"""
+    result = entry["result"]
+    response = {
+        "classification": result["classification"],
+        "confidence_score": result["confidence_score"],
+        "confidence_is_estimate": result.get("confidence_is_estimate", False),
+        "explanation": result["explanation"],
+        "language_detected": entry["language"],
+        "processing_time_ms": round(processing_time, 2),
+        "audio_duration_seconds": round(entry["duration"], 2),
+        "cached": cached,
+        "coverage": result.get("coverage"),
+        "analyzed_duration_seconds": result.get("analyzed_duration_seconds"),
         "timestamp": datetime.utcnow().isoformat()
     }
+    
+    if include_features and "detailed_analysis" in result:
+        response["detailed_analysis"] = result["detailed_analysis"]
+        if entry.get("speech_ratio") is not None:
+            # Fraction of the clip kept as speech by voice activity trimming
+            response["detailed_analysis"]["speech_ratio"] = round(entry["speech_ratio"], 4)
+    
+    if "skipped_features" in result:
+        response["skipped_features"] = result["skipped_features"]
+    
+    return response
 
 
 @app.post("/detect", response_model=VoiceDetectionResponse)
@@ -133,47 +465,97 @@ async def detect_voice(request: VoiceDetectionRequest):
     start_time = datetime.now()
     
     try:
-        # Decode base64 audio
+        # Audio was base64-decoded once during request validation
         logger.info("Processing voice detection request")
-        audio_bytes = base64.b64decode(request.audio_data)
-        
-        # Process audio
-        audio_data, sample_rate, duration = audio_processor.process_audio(audio_bytes)
-        
-        # Detect language if not provided
-        language = request.language
-        if language is None:
-            language = detector.detect_language(audio_data, sample_rate)
-            logger.info(f"Language auto-detected: {language}")
-        
-        # Perform detection
-        result = detector.detect(
-            audio_data=audio_data,
-            sample_rate=sample_rate,
-            language=language,
-            include_features=request.include_features
+        return await _detect_audio_bytes(
+            request.audio_bytes, request.language, request.include_features, start_time,
+            full_analysis=request.full_analysis
         )
         
-        # Calculate processing time
-        processing_time = (datetime.now() - start_time).total_seconds() * 1000
-        
-        # Build response
-        response = {
-            "classification": result["classification"],
-            "confidence_score": result["confidence_score"],
-            "explanation": result["explanation"],
-            "language_detected": language,
-            "processing_time_ms": round(processing_time, 2),
-            "audio_duration_seconds": round(duration, 2),
-            "timestamp": datetime.utcnow().isoformat()
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except ValueError as e:
+        logger.error(f"Validation error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid request: {str(e)}"
+        )
+    except Exception as e:
+        logger.error(f"Processing error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error processing audio: {str(e)}"
+        )
+
+
+@app.post(
+    "/detect/raw",
+    response_model=VoiceDetectionResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/octet-stream": {"schema": {"type": "string", "format": "binary"}}}
         }
+    }
+)
+async def detect_voice_raw(
+    request: Request,
+    language: Optional[Language] = Query(None, description="Language of the audio sample (or X-Language header)"),
+    include_features: Optional[bool] = Query(None, description="Include detailed audio features (or X-Include-Features header)"),
+    audio_format: Optional[str] = Query(None, description="Decoder to use instead of sniffing (e.g. pcm_s16le)"),
+    sample_rate: Optional[int] = Query(None, description="Sample rate of headerless PCM"),
+    full_analysis: bool = Query(False, description="Analyze the whole clip even if it is longer than the analysis budget"),
+    x_language: Optional[Language] = Header(None),
+    x_include_features: Optional[bool] = Header(None)
+):
+    """
+    Voice detection on a raw audio file body (application/octet-stream)
+    
+    The body goes straight to the audio processor, with no base64 inflation
+    or JSON parsing. Options are read from the query string, then headers.
+    """
+    start_time = datetime.now()
+    
+    content_type = request.headers.get("content-type", "application/octet-stream").split(";")[0].strip()
+    if content_type != "application/octet-stream" and not content_type.startswith("audio/"):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Unsupported content type: {content_type} (send application/octet-stream)"
+        )
+    
+    try:
+        # Reject before the upload is read into memory when the queue is already full
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit():
+            admission.check(admission.estimate(int(content_length), audio_format))
         
-        if request.include_features and "detailed_analysis" in result:
-            response["detailed_analysis"] = result["detailed_analysis"]
+        logger.info("Processing raw voice detection request")
+        audio_bytes = await request.body()
+        if not audio_bytes:
+            raise ValueError("Empty request body")
         
-        logger.info(f"Detection completed: {result['classification']} ({result['confidence_score']:.2f})")
-        return response
+        decoder_options = {} if sample_rate is None else {"sample_rate": sample_rate}
+        audio_processor.check_decoder_options(audio_bytes, audio_format, **decoder_options)
+        return await _detect_audio_bytes(
+            audio_bytes,
+            language if language is not None else x_language,
+            bool(include_features if include_features is not None else x_include_features),
+            start_time,
+            audio_format,
+            full_analysis,
+            **decoder_options
+        )
         
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
     except ValueError as e:
         logger.error(f"Validation error: {str(e)}")
         raise HTTPException(
@@ -193,22 +575,28 @@ async def detect_batch(request: BatchDetectionRequest):
     """
     Batch endpoint for processing multiple voice samples
     
-    Maximum 10 samples per request
+    Samples are processed concurrently, at most BATCH_CONCURRENCY at a time,
+    and each one succeeds or fails on its own: a failed sample is reported
+    in its place in results instead of failing the whole batch. For large
+    batches, /detect/batch/stream returns each result as it completes.
     """
     start_time = datetime.now()
-    results = []
+    semaphore = asyncio.Semaphore(batch_concurrency)
+    
+    async def detect_sample(idx: int, sample: AudioSample) -> Dict:
+        async with semaphore:
+            return await _detect_batch_sample(idx, sample, start_time)
     
     try:
-        for idx, sample in enumerate(request.samples):
-            logger.info(f"Processing batch sample {idx + 1}/{len(request.samples)}")
-            result = await detect_voice(sample)
-            results.append(result)
-        
+        results = await asyncio.gather(*(detect_sample(idx, sample) for idx, sample in enumerate(request.samples)))
         processing_time = (datetime.now() - start_time).total_seconds() * 1000
+        failed = sum("error" in result for result in results)
         
         return {
             "results": results,
             "total_samples": len(results),
+            "succeeded": len(results) - failed,
+            "failed": failed,
             "processing_time_ms": round(processing_time, 2)
         }
         
@@ -220,6 +608,94 @@ async def detect_batch(request: BatchDetectionRequest):
         )
 
 
+@app.post("/detect/batch/stream")
+async def detect_batch_stream(request: StreamingBatchDetectionRequest):
+    """
+    Batch endpoint streaming one NDJSON line per sample as it completes
+    
+    Samples are processed concurrently, at most BATCH_CONCURRENCY at a time,
+    and each line carries the sample's index since lines arrive in completion
+    order. A final line without an index summarizes the batch.
+    """
+    start_time = datetime.now()
+    samples = request.samples
+    
+    async def stream_results():
+        pending = set()
+        next_idx = succeeded = failed = 0
+        try:
+            while next_idx < len(samples) or pending:
+                # Start samples only as others finish, so at most BATCH_CONCURRENCY are held in flight
+                while next_idx < len(samples) and len(pending) < batch_concurrency:
+                    pending.add(asyncio.ensure_future(_detect_batch_sample(next_idx, samples[next_idx], start_time)))
+                    next_idx += 1
+                
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    if "error" in result:
+                        failed += 1
+                    else:
+                        succeeded += 1
+                    yield json.dumps(result) + "\n"
+            
+            processing_time = (datetime.now() - start_time).total_seconds() * 1000
+            yield json.dumps({
+                "total_samples": len(samples),
+                "succeeded": succeeded,
+                "failed": failed,
+                "processing_time_ms": round(processing_time, 2)
+            }) + "\n"
+        finally:
+            # Client went away: stop the samples still running
+            for task in pending:
+                task.cancel()
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
+async def _detect_batch_sample(idx: int, sample: AudioSample, start_time: datetime) -> Dict:
+    """Detection response for one batch sample, or an {index, status_code, error} entry if it fails"""
+    try:
+        response = await _detect_audio_bytes(
+            sample.decode_audio(), sample.language, sample.include_features, start_time,
+            full_analysis=sample.full_analysis
+        )
+        return dict(response, index=idx)
+    except AdmissionRejected as e:
+        return {
+            "index": idx,
+            "status_code": status.HTTP_429_TOO_MANY_REQUESTS,
+            "error": str(e),
+            "retry_after": e.retry_after
+        }
+    except ValueError as e:
+        logger.error(f"Batch sample {idx + 1} validation error: {str(e)}")
+        return {"index": idx, "status_code": status.HTTP_400_BAD_REQUEST, "error": f"Invalid request: {str(e)}"}
+    except Exception as e:
+        logger.error(f"Batch sample {idx + 1} processing error: {str(e)}")
+        return {
+            "index": idx,
+            "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR,
+            "error": f"Error processing audio: {str(e)}"
+        }
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Result cache hit/miss counters and occupancy, plus feature store counters when enabled"""
+    stats = result_cache.stats()
+    if feature_store is not None:
+        stats["feature_store"] = feature_store.stats()
+    return stats
+
+
+@app.get("/scheduler/stats")
+async def scheduler_stats():
+    """Micro-batching queue depth and batch-size counters"""
+    return detection_scheduler.stats()
+
+
 @app.get("/languages")
 async def get_supported_languages():
     """Get list of supported languages with details"""
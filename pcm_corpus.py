@@ -0,0 +1,181 @@
+"""
+PCM Corpus Module
+Decoded, preprocessed audio stored as one contiguous raw file with an
+offset/length index, so corpora can be re-scored without re-decoding
+"""
+
+import json
+import time
+import argparse
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import numpy as np
+import logging
+
+from audio_processor import AudioProcessor
+
+logger = logging.getLogger(__name__)
+
+
+class PCMCorpusWriter:
+    """
+    Appends preprocessed clips to <path>.pcm and records them in <path>.json
+
+    Samples are written back to back as little-endian float32 at the
+    processor's target sample rate, exactly as the detector receives them
+    from the API (decoded, resampled, pre-emphasised and, when the
+    processor's VAD is enabled, trimmed to speech). Use as a context
+    manager; the index is written on close.
+    """
+
+    def __init__(self, path: Union[str, Path], sample_rate: int = 16000):
+        """
+        Args:
+            path: Corpus path without extension (directory is created if missing)
+            sample_rate: Sample rate of the stored clips
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.sample_rate = sample_rate
+        self.clips: List[Dict] = []
+        self.n_samples = 0
+        self._file = open(self.path.with_suffix(".pcm"), "wb")
+
+    def add(self, name: str, audio_data: np.ndarray, **metadata) -> Dict:
+        """Append one clip; metadata (e.g. duration, language) is kept in its index entry"""
+        audio_data = np.ascontiguousarray(audio_data, dtype="<f4")
+        audio_data.tofile(self._file)
+
+        entry = dict(metadata, name=name, offset=self.n_samples, length=len(audio_data))
+        self.clips.append(entry)
+        self.n_samples += len(audio_data)
+        return entry
+
+    def close(self):
+        """Flush the samples and write the index"""
+        if self._file.closed:
+            return
+        self._file.close()
+        index = {"sample_rate": self.sample_rate, "dtype": "<f4", "n_samples": self.n_samples, "clips": self.clips}
+        with open(self.path.with_suffix(".json"), "w") as f:
+            json.dump(index, f)
+        logger.info(f"Wrote {len(self.clips)} clips ({self.n_samples / self.sample_rate:.1f}s) to {self.path}")
+
+    def __enter__(self) -> "PCMCorpusWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class PCMCorpus:
+    """
+    Read-only, memory-mapped view of a corpus written by PCMCorpusWriter
+
+    The whole .pcm file is mapped once; each clip is a slice of that map,
+    so reading a clip copies nothing and pages are loaded by the OS on
+    first touch. Clips can be passed straight to VoiceDetector.detect.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Args:
+            path: Corpus path without extension
+        """
+        self.path = Path(path)
+        with open(self.path.with_suffix(".json")) as f:
+            index = json.load(f)
+        self.sample_rate = index["sample_rate"]
+        self.clips: List[Dict] = index["clips"]
+        self._positions = {entry["name"]: position for position, entry in enumerate(self.clips)}
+
+        if index["n_samples"]:
+            self._data = np.memmap(
+                self.path.with_suffix(".pcm"), dtype=index["dtype"], mode="r", shape=(index["n_samples"],)
+            )
+        else:
+            self._data = np.empty(0, dtype=index["dtype"])
+
+    def __len__(self) -> int:
+        return len(self.clips)
+
+    def __getitem__(self, key: Union[int, str]) -> np.ndarray:
+        """Samples of the clip at a position or with a name (a memmap slice, not a copy)"""
+        entry = self.clips[self._positions[key] if isinstance(key, str) else key]
+        return self._data[entry["offset"]:entry["offset"] + entry["length"]]
+
+    def __iter__(self) -> Iterator[Tuple[Dict, np.ndarray]]:
+        """(index entry, samples) for every clip in storage order"""
+        for entry in self.clips:
+            yield entry, self._data[entry["offset"]:entry["offset"] + entry["length"]]
+
+
+def build_corpus(
+    audio_paths: Iterable[Union[str, Path]],
+    corpus_path: Union[str, Path],
+    processor: Optional[AudioProcessor] = None
+) -> int:
+    """
+    Decode audio files once and write them into a PCM corpus
+
+    Files that fail to decode are logged and skipped.
+
+    Returns:
+        Number of clips written
+    """
+    processor = processor or AudioProcessor()
+    with PCMCorpusWriter(corpus_path, processor.target_sample_rate) as writer:
+        for audio_path in audio_paths:
+            audio_path = Path(audio_path)
+            try:
+                audio_data, sample_rate, duration = processor.process_audio(audio_path.read_bytes())
+            except ValueError as e:
+                logger.warning(f"Skipping {audio_path}: {e}")
+                continue
+
+            metadata = {"duration": round(duration, 3)}
+            if processor.vad:
+                audio_data, speech_ratio = processor.trim_silence(audio_data, sample_rate)
+                metadata["speech_ratio"] = round(speech_ratio, 4)
+            writer.add(str(audio_path), audio_data, **metadata)
+        return len(writer.clips)
+
+
+def score_corpus(corpus_path: Union[str, Path], language: str = "english", include_features: bool = False):
+    """Run detection over every clip of a corpus, printing one JSON line per clip and a throughput summary"""
+    from voice_detector import VoiceDetector
+
+    corpus = PCMCorpus(corpus_path)
+    detector = VoiceDetector()
+    start = time.perf_counter()
+    for entry, audio_data in corpus:
+        result = detector.detect(audio_data, corpus.sample_rate, language, include_features)
+        print(json.dumps({"name": entry["name"], **result}))
+
+    elapsed = time.perf_counter() - start
+    audio_seconds = sum(entry["length"] for entry in corpus.clips) / corpus.sample_rate
+    logger.info(
+        f"Scored {len(corpus)} clips ({audio_seconds:.1f}s of audio) in {elapsed:.2f}s "
+        f"({audio_seconds / max(elapsed, 1e-9):.0f}x real time)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or score a preprocessed PCM corpus")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = commands.add_parser("build", help="Decode audio files into a corpus")
+    build_parser.add_argument("corpus", help="Corpus path without extension")
+    build_parser.add_argument("audio_files", nargs="+", help="Audio files to decode")
+
+    score_parser = commands.add_parser("score", help="Run detection over a corpus")
+    score_parser.add_argument("corpus", help="Corpus path without extension")
+    score_parser.add_argument("--language", default="english", help="Language of the clips")
+    score_parser.add_argument("--include-features", action="store_true", help="Include detailed features")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == "build":
+        build_corpus(args.audio_files, args.corpus)
+    else:
+        score_corpus(args.corpus, args.language, args.include_features)
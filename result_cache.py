@@ -0,0 +1,118 @@
+"""
+Result Cache Module
+Content-addressed cache of detection results with LRU eviction,
+a time-to-live and a memory cap
+"""
+
+import copy
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CacheEntry(NamedTuple):
+    """A cached value with its approximate size and expiry time"""
+    value: Dict
+    size: int
+    expires_at: float
+
+
+class ResultCache:
+    """
+    LRU cache of detection results keyed by a hash of the audio file bytes
+    and the options that change the result
+
+    Entries expire ttl_seconds after they are stored. When the estimated
+    size of all entries exceeds max_bytes, the least recently used entries
+    are evicted first. Safe to share between threads.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl_seconds: Optional[float] = 3600):
+        """
+        Args:
+            max_bytes: Memory cap for cached results (estimated from their JSON size)
+            ttl_seconds: Lifetime of an entry in seconds (None = never expires)
+        """
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def key(audio_bytes: bytes, language: Optional[str], include_features: bool, **options) -> str:
+        """SHA-256 of the audio bytes plus language, include_features and any decoder options"""
+        digest = hashlib.sha256(audio_bytes)
+        digest.update(json.dumps([language, include_features, options], sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Cached value for key, or None on a miss (expired entries count as misses)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds is not None and entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry.value)
+
+    def put(self, key: str, value: Dict):
+        """Store value under key, evicting least recently used entries to stay under max_bytes"""
+        size = len(json.dumps(value, default=str)) + len(key)
+        if size > self.max_bytes:
+            return
+
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds is not None else float("inf")
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = CacheEntry(copy.deepcopy(value), size, expires_at)
+            self.size += size
+
+            while self.size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        self.size -= entry.size
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and current occupancy"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
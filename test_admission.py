@@ -0,0 +1,115 @@
+"""
+Admission control tests: FIFO queueing, rejection once the queue is full,
+cancelled waiters and byte-rate estimates
+"""
+
+import asyncio
+
+import pytest
+
+from admission import AdmissionController, AdmissionRejected
+
+
+def test_admission_queueing():
+    async def scenario():
+        admission = AdmissionController(max_in_flight_seconds=10, max_queued_seconds=10)
+        order = []
+        release = asyncio.Event()
+
+        async def request(name: str, cost: float):
+            async with admission.admit(cost):
+                order.append(name)
+                await release.wait()
+
+        running = asyncio.ensure_future(request("first", 8))
+        await asyncio.sleep(0)
+        queued = [asyncio.ensure_future(request(name, 4)) for name in ("second", "third")]
+        await asyncio.sleep(0)
+        assert order == ["first"]
+        assert admission.stats()["queued"] == 2
+        assert admission.stats()["queued_seconds"] == 8
+
+        # The queue holds 8 of 10 seconds, so 4 more cannot wait and are rejected
+        with pytest.raises(AdmissionRejected) as rejected:
+            admission.check(4)
+        assert 1 <= rejected.value.retry_after <= 60
+        assert admission.stats()["rejected"] == 1
+
+        release.set()
+        await asyncio.gather(running, *queued)
+        assert order == ["first", "second", "third"]
+        assert admission.stats()["admitted"] == 3
+        assert admission.stats()["in_flight_seconds"] == 0
+        assert admission.stats()["queued_seconds"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_admission_cancelled_waiter():
+    async def scenario():
+        admission = AdmissionController(max_in_flight_seconds=10, max_queued_seconds=100)
+        release = asyncio.Event()
+
+        async def hold(cost: float):
+            async with admission.admit(cost):
+                await release.wait()
+
+        running = asyncio.ensure_future(hold(10))
+        await asyncio.sleep(0)
+        waiting = asyncio.ensure_future(hold(5))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        assert admission.stats()["queued"] == 0
+        assert admission.stats()["queued_seconds"] == 0
+
+        release.set()
+        await running
+        assert admission.stats()["in_flight"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_admission_cancel_during_release():
+    async def scenario():
+        admission = AdmissionController(max_in_flight_seconds=10, max_queued_seconds=100)
+        release = asyncio.Event()
+
+        async def hold(cost: float):
+            async with admission.admit(cost):
+                await release.wait()
+            return "done"
+
+        running = asyncio.ensure_future(hold(10))
+        await asyncio.sleep(0)
+        waiting = asyncio.ensure_future(hold(5))
+        await asyncio.sleep(0)
+        assert admission.stats()["queued"] == 1
+
+        # The holder releases before the cancelled waiter gets to run its handler
+        release.set()
+        waiting.cancel()
+        assert await running == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+        stats = admission.stats()
+        assert stats["in_flight"] == 0
+        assert stats["in_flight_seconds"] == 0
+        assert stats["queued"] == 0
+        assert stats["queued_seconds"] == 0
+        assert stats["admitted"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_admission_estimates_by_container():
+    admission = AdmissionController(max_cost=300)
+    assert admission.estimate(64000, "wav") == pytest.approx(2.0)
+    assert admission.estimate(10 ** 9, "mp3") == 300
+    # An unknown container is estimated with the highest known byte rate, i.e. the fewest seconds
+    assert admission.estimate(64000, None) == pytest.approx(2.0)
+
+    admission.observe(16000, "mp3", 2.0)
+    assert admission.byte_rates["mp3"] == pytest.approx(0.8 * 16000 + 0.2 * 8000)
@@ -0,0 +1,91 @@
+"""
+Audio processor tests: the in-process WAV decoder, preprocessing and
+container sniffing
+"""
+
+import struct
+
+import numpy as np
+import pytest
+
+from audio_processor import AudioProcessor, _decode_wav
+
+SAMPLE_RATE = 16000
+
+
+def _wav_bytes(
+    data: bytes,
+    format_tag: int,
+    bits: int,
+    channels: int = 1,
+    sample_rate: int = SAMPLE_RATE,
+    extensible: bool = False
+) -> bytes:
+    """RIFF/WAVE file with an odd-sized chunk before fmt, so chunk padding is exercised"""
+    block_align = channels * bits // 8
+    fmt = struct.pack("<HHIIHH", 0xFFFE if extensible else format_tag, channels, sample_rate,
+                      sample_rate * block_align, block_align, bits)
+    if extensible:
+        fmt += struct.pack("<HHIH", 22, bits, 0, format_tag) + bytes(14)
+    chunks = b"LIST" + struct.pack("<I", 3) + b"abc\0"
+    chunks += b"fmt " + struct.pack("<I", len(fmt)) + fmt
+    chunks += b"data" + struct.pack("<I", len(data)) + data
+    return b"RIFF" + struct.pack("<I", 4 + len(chunks)) + b"WAVE" + chunks
+
+
+@pytest.mark.parametrize("format_tag, bits, dtype", [
+    (1, 8, "u1"), (1, 16, "<i2"), (1, 32, "<i4"), (3, 32, "<f4"), (3, 64, "<f8")
+])
+@pytest.mark.parametrize("extensible", [False, True])
+def test_wav_formats(format_tag, bits, dtype, extensible):
+    rng = np.random.default_rng(bits)
+    if format_tag == 3:
+        expected = rng.uniform(-1, 1, (400, 2)).astype(dtype)
+    else:
+        info = np.iinfo(dtype)
+        expected = rng.integers(info.min, info.max, (400, 2), endpoint=True).astype(dtype)
+
+    samples, sample_rate = _decode_wav(_wav_bytes(expected.tobytes(), format_tag, bits, 2, 22050, extensible))
+    assert sample_rate == 22050
+    assert samples.dtype == np.dtype(dtype)
+    np.testing.assert_array_equal(samples, expected)
+
+
+def test_wav_24_bit():
+    expected = np.array([[0], [1], [-1], [8388607], [-8388608]], dtype=np.int32)
+    packed = b"".join(int(value).to_bytes(3, "little", signed=True) for value in expected[:, 0])
+
+    samples, _ = _decode_wav(_wav_bytes(packed, 1, 24))
+    np.testing.assert_array_equal(samples, expected << 8)
+
+
+def test_wav_errors():
+    with pytest.raises(ValueError, match="Unsupported WAV encoding"):
+        _decode_wav(_wav_bytes(bytes(12), 1, 12))
+    with pytest.raises(ValueError, match="no data chunk"):
+        _decode_wav(b"RIFF" + struct.pack("<I", 4) + b"WAVE")
+
+
+def test_wav_processing():
+    audio = (np.sin(2 * np.pi * 440 * np.arange(44100) / 44100) * 16000).astype("<i2")
+    stereo = np.stack([audio, audio], axis=1)
+
+    audio_data, sample_rate, duration = AudioProcessor().process_audio(
+        _wav_bytes(stereo.tobytes(), 1, 16, 2, 44100)
+    )
+    assert sample_rate == SAMPLE_RATE
+    assert audio_data.dtype == np.float32
+    assert len(audio_data) == SAMPLE_RATE
+    assert duration == pytest.approx(1.0)
+
+
+def test_sniff_container():
+    processor = AudioProcessor()
+    assert processor.sniff_container(_wav_bytes(bytes(32000), 1, 16)) == "wav"
+    assert processor.sniff_container(b"fLaC" + bytes(12)) == "flac"
+    assert processor.sniff_container(b"OggS" + bytes(12)) == "ogg"
+    assert processor.sniff_container(b"ID3" + bytes(13)) == "mp3"
+    assert processor.sniff_container(bytes(16), "pcm_s16le") == "pcm_s16le"
+    assert processor.sniff_container(bytes(16)) == "other"
+    with pytest.raises(ValueError, match="Unknown audio format"):
+        processor.sniff_container(bytes(16), "bogus")
@@ -0,0 +1,68 @@
+"""
+Micro-batch scheduler tests: batches split over the workers, per-item
+errors and callers released when a batch is cancelled
+"""
+
+import asyncio
+
+import pytest
+
+from batch_scheduler import MicroBatchScheduler
+
+
+def test_scheduler_splits_submissions():
+    async def scenario():
+        batches = []
+
+        async def run_batch(items):
+            batches.append(list(items))
+            await asyncio.sleep(0)
+            return [item * 2 for item in items]
+
+        scheduler = MicroBatchScheduler(run_batch, max_batch_size=4, parallelism=2)
+        results = await asyncio.gather(*(scheduler.submit(item) for item in range(6)))
+        assert results == [item * 2 for item in range(6)]
+        # Submitted together: an even share of the queue per worker
+        assert batches == [[0, 1, 2], [3, 4, 5]]
+        assert scheduler.stats()["batch_sizes"] == {3: 2}
+        assert scheduler.stats()["in_flight_batches"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_scheduler_item_errors():
+    async def scenario():
+        async def run_batch(items):
+            return [ValueError(item) if item < 0 else item for item in items]
+
+        scheduler = MicroBatchScheduler(run_batch)
+        good, bad = await asyncio.gather(scheduler.submit(1), scheduler.submit(-1), return_exceptions=True)
+        assert good == 1
+        assert isinstance(bad, ValueError)
+
+    asyncio.run(scenario())
+
+
+def test_scheduler_cancelled_batch():
+    async def scenario():
+        started = asyncio.Event()
+
+        async def run_batch(items):
+            started.set()
+            await asyncio.Event().wait()
+
+        scheduler = MicroBatchScheduler(run_batch)
+        callers = [asyncio.ensure_future(scheduler.submit(item)) for item in range(3)]
+        await started.wait()
+        for task in list(scheduler._tasks):
+            task.cancel()
+
+        # Callers are cancelled with the batch instead of waiting forever
+        done, pending = await asyncio.wait(callers, timeout=1)
+        assert not pending
+        for caller in callers:
+            with pytest.raises(asyncio.CancelledError):
+                caller.result()
+        assert scheduler.in_flight == 0
+
+    asyncio.run(scenario())
@@ -96,7 +96,42 @@ class VoiceDetectionClient:
                 "status_code": response.status_code,
                 "detail": response.json()
             }
-    
+
+    def detect_raw_from_file(self, file_path: str, language: str = None, include_features: bool = False):
+        """
+        Detect voice by uploading the file bytes directly (no base64)
+
+        Args:
+            file_path: Path to audio file
+            language: Optional language code
+            include_features: Whether to include detailed features
+
+        Returns:
+            Detection result
+        """
+        with open(file_path, 'rb') as f:
+            audio_bytes = f.read()
+
+        params = {"include_features": str(include_features).lower()}
+        if language:
+            params["language"] = language
+
+        response = self.session.post(
+            f"{self.base_url}/detect/raw",
+            params=params,
+            data=audio_bytes,
+            headers={"Content-Type": "application/octet-stream"}
+        )
+
+        if response.status_code == 200:
+            return response.json()
+        else:
+            return {
+                "error": True,
+                "status_code": response.status_code,
+                "detail": response.json()
+            }
+
     def detect_batch(self, file_paths: list, languages: list = None, include_features: bool = False):
         """
         Detect voice from multiple files
@@ -140,13 +175,62 @@ class VoiceDetectionClient:
                 "detail": response.json()
             }
 
+    
+    def detect_batch_stream(self, file_paths: list, languages: list = None, include_features: bool = False):
+        """
+        Detect voice from many files, yielding each result as soon as it completes
+        
+        Args:
+            file_paths: List of paths to audio files
+            languages: Optional list of language codes (same length as file_paths)
+            include_features: Whether to include detailed features
+            
+        Yields:
+            One result per file in completion order, with its "index" in
+            file_paths (failed files carry "error"), then a final summary
+            with total_samples, succeeded, failed and processing_time_ms
+        """
+        samples = []
+        
+        for idx, file_path in enumerate(file_paths):
+            with open(file_path, 'rb') as f:
+                audio_bytes = f.read()
+            
+            sample = {
+                "audio_data": base64.b64encode(audio_bytes).decode('utf-8'),
+                "include_features": include_features
+            }
+            
+            if languages and idx < len(languages):
+                sample["language"] = languages[idx]
+            
+            samples.append(sample)
+        
+        with self.session.post(
+            f"{self.base_url}/detect/batch/stream",
+            json={"samples": samples},
+            stream=True
+        ) as response:
+            if response.status_code != 200:
+                yield {
+                    "error": True,
+                    "status_code": response.status_code,
+                    "detail": response.json()
+                }
+                return
+            
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
+
 
 def print_result(result: dict):
     """Pretty print detection result"""
     print("\n" + "="*60)
     
     if result.get("error"):
-        print(f"ERROR: {result.get('detail')}")
+        # Request errors carry a detail; failed batch samples carry the message in error
+        print(f"ERROR: {result.get('detail', result.get('error'))}")
         return
     
     print(f"Classification: {result['classification'].upper()}")
@@ -214,6 +298,19 @@ if __name__ == "__main__":
     #         print(f"\nSample {idx}:")
     #         print_result(result)
     
+    # Example 3: Streaming batch detection
+    print("\n\nExample 3: Streaming Batch Detection")
+    print("-" * 60)
+    
+    # NOTE: Replace with actual file paths
+    # for line in client.detect_batch_stream(file_paths=["sample1.mp3", "sample2.mp3"]):
+    #     if "index" in line:
+    #         print(f"\nSample {line['index'] + 1}:")
+    #         print_result(line)
+    #     else:
+    #         print(f"\nDone: {line['succeeded']}/{line['total_samples']} succeeded "
+    #               f"in {line['processing_time_ms']:.2f}ms")
+    
     print("\n\nTo test with actual audio files:")
     print("1. Place MP3 files in the same directory")
     print("2. Uncomment the example code above")
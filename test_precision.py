@@ -0,0 +1,90 @@
+"""
+Precision tests: float32 mode keeps every stage of feature extraction in
+float32/complex64 and stays within tolerance of float64 mode, and batched
+detection gives the same results as detecting each clip
+"""
+
+import numpy as np
+import pytest
+
+from voice_detector import AnalysisContext, VoiceDetector
+
+SAMPLE_RATE = 16000
+
+
+def _voice_like(duration: float = 2.0, seed: int = 0) -> np.ndarray:
+    """Harmonic tone with a wandering pitch, amplitude modulation and noise"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+    f0 = 140 + 15 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+    audio = sum(np.sin(k * phase) / k for k in range(1, 6))
+    audio *= 0.5 + 0.4 * np.sin(2 * np.pi * 3 * t) ** 2
+    return (0.3 * audio + 0.01 * rng.standard_normal(len(t))).astype(np.float64)
+
+
+@pytest.fixture(scope="module")
+def audio() -> np.ndarray:
+    return _voice_like()
+
+
+def test_float32_stages(audio):
+    detector = VoiceDetector(precision="float32")
+    context = AnalysisContext(detector, np.asarray(audio, dtype=detector.dtype), SAMPLE_RATE)
+
+    assert detector.fft.rfft(context.get("audio")).dtype == np.complex64
+    assert context.get("spectrum").magnitude.dtype == np.float32
+    assert context.get("autocorrelation").values.dtype == np.float32
+    assert context.get("frames").frames.dtype == np.float32
+    assert context.get("frames").energy.dtype == np.float32
+    assert context.get("mfcc").coefficients.dtype == np.float32
+    assert context.get("pitch").periods.dtype == np.float32
+
+
+def test_float64_stages(audio):
+    detector = VoiceDetector(precision="float64")
+    context = AnalysisContext(detector, np.asarray(audio, dtype=detector.dtype), SAMPLE_RATE)
+
+    assert context.get("spectrum").magnitude.dtype == np.float64
+    assert context.get("autocorrelation").values.dtype == np.float64
+    assert context.get("mfcc").coefficients.dtype == np.float64
+    assert context.get("pitch").periods.dtype == np.float64
+
+
+def test_unsupported_precision():
+    with pytest.raises(ValueError):
+        VoiceDetector(precision="float16")
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_float32_matches_float64(seed):
+    audio = _voice_like(seed=seed)
+    single = VoiceDetector(precision="float32")
+    double = VoiceDetector(precision="float64")
+
+    features32 = single.extract_features(audio, SAMPLE_RATE)
+    features64 = double.extract_features(audio, SAMPLE_RATE)
+    assert features32.keys() == features64.keys()
+    for name in features64:
+        assert features32[name] == pytest.approx(features64[name], rel=1e-3, abs=1e-4), name
+
+    result32 = single.detect(audio, SAMPLE_RATE, "english", include_features=True)
+    result64 = double.detect(audio, SAMPLE_RATE, "english", include_features=True)
+    assert result32["classification"] == result64["classification"]
+    assert result32["confidence_score"] == pytest.approx(result64["confidence_score"], abs=1e-6)
+
+
+@pytest.mark.parametrize("include_features", [False, True])
+def test_detect_many_matches_detect(include_features):
+    detector = VoiceDetector(analysis_budget=2.0)
+    clips = [_voice_like(duration, seed) for seed, duration in enumerate((0.7, 1.5, 3.1, 2.0))]
+    languages = ["english", "tamil", "hindi", "english"]
+    full_analysis = [False, False, False, True]
+
+    batched = detector.detect_many(clips, SAMPLE_RATE, languages, include_features, full_analysis)
+    single = [
+        detector.detect(clip, SAMPLE_RATE, language, include_features, full)
+        for clip, language, full in zip(clips, languages, full_analysis)
+    ]
+    assert batched == single
+    assert detector.detect_many([], SAMPLE_RATE, "english") == []
@@ -0,0 +1,57 @@
+"""
+Result cache tests: LRU eviction under the memory cap, TTL expiry, keys
+and copy isolation
+"""
+
+import json
+
+import result_cache
+from result_cache import ResultCache
+
+
+def test_cache_lru_eviction():
+    value = {"classification": "ai_generated", "confidence_score": 0.75}
+    entry_size = 64 + len(json.dumps(value))
+    cache = ResultCache(max_bytes=3 * entry_size, ttl_seconds=None)
+
+    for name in ("a", "b", "c"):
+        cache.put(name * 64, value)
+    assert cache.get("a" * 64) == value  # "a" becomes most recently used
+    cache.put("d" * 64, value)
+
+    assert cache.get("b" * 64) is None
+    assert cache.get("a" * 64) == value
+    assert cache.get("c" * 64) == value
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size_bytes"] <= cache.max_bytes
+
+
+def test_cache_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(result_cache.time, "monotonic", lambda: now[0])
+    cache = ResultCache(ttl_seconds=60)
+
+    cache.put("key", {"confidence_score": 0.5})
+    now[0] += 59
+    assert cache.get("key") == {"confidence_score": 0.5}
+    now[0] += 1
+    assert cache.get("key") is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_cache_keys_and_copies():
+    assert ResultCache.key(b"audio", "english", False) != ResultCache.key(b"audio", "english", True)
+    assert ResultCache.key(b"audio", "english", False) != ResultCache.key(b"audio", "tamil", False)
+    assert ResultCache.key(b"audio", None, False, sample_rate=8000) != ResultCache.key(b"audio", None, False)
+
+    cache = ResultCache()
+    value = {"detailed_analysis": {"features": {"jitter": 0.01}}}
+    cache.put("key", value)
+    value["detailed_analysis"]["features"]["jitter"] = 1.0
+    cached = cache.get("key")
+    cached["detailed_analysis"]["features"]["jitter"] = 2.0
+    assert cache.get("key") == {"detailed_analysis": {"features": {"jitter": 0.01}}}
+
+    cache.put("large", {"data": "x" * cache.max_bytes})
+    assert cache.get("large") is None
@@ -3,21 +3,741 @@ Voice Detector Module
 Core detection logic for identifying AI-generated vs human-generated voices
 """
 
+import copy
 import numpy as np
-from typing import Dict, Tuple, Optional
+from typing import Callable, Dict, Iterable, List, NamedTuple, Sequence, Tuple, Optional, Union
 import logging
+from functools import lru_cache
 from scipy import signal
-from scipy.fft import fft
+from scipy.fft import rfftfreq
 from scipy.stats import entropy, kurtosis, skew
 
+from fft_service import FFTService, default_fft
+
 logger = logging.getLogger(__name__)
 
 
+class SpectralAnalysis:
+    """
+    Spectrum of a whole signal, computed once per request
+    and shared by every spectral feature
+    """
+
+    def __init__(self, audio_data: np.ndarray, sample_rate: int, fft: FFTService = default_fft):
+        self.sample_rate = sample_rate
+        self.n_samples = len(audio_data)
+        self.n_fft = fft.fast_length(self.n_samples)
+
+        # Real FFT at a fast length; keep positive frequencies only (DC up to, not including, Nyquist)
+        self.magnitude = np.abs(fft.rfft(audio_data, self.n_fft))[:self.n_fft // 2]
+        self._log_magnitude = None
+
+    @classmethod
+    def from_magnitude(
+        cls,
+        magnitude: np.ndarray,
+        n_fft: int,
+        sample_rate: int
+    ) -> 'SpectralAnalysis':
+        """Wrap an already computed positive-frequency magnitude spectrum of an n_fft-point transform"""
+        spectrum = cls.__new__(cls)
+        spectrum.sample_rate = sample_rate
+        spectrum.n_samples = n_fft
+        spectrum.n_fft = n_fft
+        spectrum.magnitude = magnitude[:n_fft // 2]
+        spectrum._log_magnitude = None
+        return spectrum
+
+    @property
+    def log_magnitude(self) -> np.ndarray:
+        """Natural log of the magnitude spectrum, computed on first use"""
+        if self._log_magnitude is None:
+            self._log_magnitude = np.log(self.magnitude + 1e-10)
+        return self._log_magnitude
+
+
+class AutocorrelationAnalysis:
+    """
+    Autocorrelation of a whole signal via the FFT (Wiener-Khinchin),
+    computed once per request and limited to the lags of a pitch range
+    """
+
+    def __init__(
+        self,
+        audio_data: np.ndarray,
+        sample_rate: int,
+        pitch_range: Tuple[float, float] = (50.0, 500.0),
+        fft: FFTService = default_fft
+    ):
+        n_samples = len(audio_data)
+        pitch_floor, pitch_ceiling = pitch_range
+        self.sample_rate = sample_rate
+        self.min_lag = max(1, int(sample_rate / pitch_ceiling))
+        self.max_lag = max(0, min(n_samples - 1, int(np.ceil(sample_rate / pitch_floor))))
+
+        # Zero-pad past max_lag so circular wrap-around cannot reach the lags we keep
+        n_fft = fft.fast_length(n_samples + self.max_lag)
+        spectrum = fft.rfft(audio_data, n_fft)
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+        self.values = fft.irfft(power, n_fft)[:self.max_lag + 1]
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, sample_rate: int, min_lag: int) -> 'AutocorrelationAnalysis':
+        """Wrap autocorrelation values for lags 0..len(values) - 1 accumulated elsewhere"""
+        autocorr = cls.__new__(cls)
+        autocorr.sample_rate = sample_rate
+        autocorr.min_lag = min_lag
+        autocorr.max_lag = len(values) - 1
+        autocorr.values = values
+        return autocorr
+
+    @property
+    def energy(self) -> float:
+        """Zero-lag autocorrelation (total signal energy)"""
+        return float(self.values[0]) if len(self.values) else 0.0
+
+    @property
+    def pitch_lags(self) -> np.ndarray:
+        """Autocorrelation restricted to lags inside the pitch range"""
+        return self.values[self.min_lag:]
+
+
+def _frame_view(data: np.ndarray, frame_length: int, hop_length: int) -> np.ndarray:
+    """
+    Zero-copy 2-D (n_frames, frame_length) strided view over a 1-D signal
+
+    Frames start at 0, hop_length, ... strictly before len(data) - frame_length,
+    matching the frame loops the features were originally written with.
+    """
+    n_frames = len(range(0, len(data) - frame_length, hop_length))
+    if n_frames <= 0:
+        return np.empty((0, max(frame_length, 0)), dtype=data.dtype)
+    stride = data.strides[0]
+    return np.lib.stride_tricks.as_strided(
+        data,
+        shape=(n_frames, frame_length),
+        strides=(hop_length * stride, stride),
+        writeable=False
+    )
+
+
+# Frames per batched FFT in the frame-wise analyses; bounds temporaries on long clips
+FRAME_BLOCK = 2048
+
+
+@lru_cache(maxsize=8)
+def _mfcc_matrices(
+    sample_rate: int,
+    n_fft: int,
+    n_mels: int,
+    n_mfcc: int,
+    dtype: np.dtype = np.float32
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mel filterbank (n_mels, n_fft // 2 + 1) and orthonormal DCT-II (n_mfcc, n_mels)
+    matrices, built once per configuration so requests only do matrix multiplies
+    """
+    # Triangular filters equally spaced on the (HTK) mel scale up to Nyquist
+    max_mel = 2595.0 * np.log10(1.0 + (sample_rate / 2) / 700.0)
+    mel_points = np.linspace(0.0, max_mel, n_mels + 2)
+    hz_points = 700.0 * (10 ** (mel_points / 2595.0) - 1.0)
+    bin_freqs = rfftfreq(n_fft, 1 / sample_rate)
+    
+    lower = hz_points[:-2, np.newaxis]
+    center = hz_points[1:-1, np.newaxis]
+    upper = hz_points[2:, np.newaxis]
+    rising = (bin_freqs - lower) / (center - lower)
+    falling = (upper - bin_freqs) / (upper - center)
+    filterbank = np.maximum(0.0, np.minimum(rising, falling))
+    
+    # DCT-II with orthonormal scaling
+    k = np.arange(n_mfcc)[:, np.newaxis]
+    n = np.arange(n_mels)[np.newaxis, :]
+    dct = np.sqrt(2.0 / n_mels) * np.cos(np.pi * k * (2 * n + 1) / (2 * n_mels))
+    dct[0] /= np.sqrt(2.0)
+    
+    filterbank = filterbank.astype(dtype)
+    dct = dct.astype(dtype)
+    filterbank.flags.writeable = False
+    dct.flags.writeable = False
+    return filterbank, dct
+
+
+class FrameAnalysis:
+    """
+    Framed view of a signal, built once per request; per-frame
+    statistics are whole-array reductions computed on first use
+    """
+
+    def __init__(self, audio_data: np.ndarray, frame_length: int = 1024, hop_length: int = 512):
+        self.audio_data = audio_data
+        self.frame_length = frame_length
+        self.hop_length = hop_length
+        self.frames = _frame_view(audio_data, frame_length, hop_length)
+        self.n_frames = len(self.frames)
+        self._energy = None
+        self._zcr = None
+
+    @property
+    def energy(self) -> np.ndarray:
+        """Sum of squares of each frame"""
+        if self._energy is None:
+            self._energy = np.einsum('ij,ij->i', self.frames, self.frames)
+        return self._energy
+
+    @property
+    def rms(self) -> np.ndarray:
+        """Root-mean-square amplitude of each frame"""
+        return np.sqrt(self.energy / self.frame_length)
+
+    @property
+    def zcr(self) -> np.ndarray:
+        """Zero crossing rate of each frame"""
+        if self._zcr is None:
+            # Crossings between neighbouring samples, computed once for the whole
+            # signal and then framed with the same hop (one fewer pair per frame)
+            crossings = np.abs(np.diff(np.sign(self.audio_data))) / 2
+            crossing_frames = _frame_view(crossings, self.frame_length - 1, self.hop_length)[:self.n_frames]
+            self._zcr = crossing_frames.sum(axis=1) / self.frame_length
+        return self._zcr
+
+    def subset(self, audio_data: np.ndarray, start: int, stop: int) -> 'FrameAnalysis':
+        """Frames [start, stop) as the FrameAnalysis of the clip audio_data they cover"""
+        part = copy.copy(self)
+        part.audio_data = audio_data
+        part.frames = self.frames[start:stop]
+        part.n_frames = len(part.frames)
+        part._energy = None if self._energy is None else self._energy[start:stop]
+        part._zcr = None if self._zcr is None else self._zcr[start:stop]
+        return part
+
+
+class PitchTrack:
+    """
+    Frame-wise F0 track from autocorrelation of every frame, computed with
+    batched FFTs over the frame matrix (cost is linear in duration)
+    """
+
+    def __init__(
+        self,
+        frames: FrameAnalysis,
+        sample_rate: int,
+        pitch_range: Tuple[float, float] = (50.0, 500.0),
+        voicing_threshold: float = 0.3,
+        fft: FFTService = default_fft
+    ):
+        pitch_floor, pitch_ceiling = pitch_range
+        frame_length = frames.frame_length
+        self.sample_rate = sample_rate
+        self._fft = fft
+        self.min_lag = max(1, int(sample_rate / pitch_ceiling))
+        self.max_lag = max(self.min_lag, min(frame_length - 2, int(np.ceil(sample_rate / pitch_floor))))
+        
+        n_frames = frames.n_frames
+        self.periods = np.zeros(n_frames, dtype=frames.frames.dtype)
+        self.voiced = np.zeros(n_frames, dtype=bool)
+        if n_frames == 0 or self.max_lag <= self.min_lag:
+            return
+        
+        # Batched over blocks of frames so FFT temporaries stay bounded on long clips
+        for start in range(0, n_frames, FRAME_BLOCK):
+            stop = min(start + FRAME_BLOCK, n_frames)
+            self.periods[start:stop], self.voiced[start:stop] = self._track(
+                frames.frames[start:stop], voicing_threshold
+            )
+
+    def _track(self, frames: np.ndarray, voicing_threshold: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Pitch periods and voicing of a 2-D block of frames"""
+        # Per-frame autocorrelation up to max_lag + 1 (one extra lag for interpolation)
+        fft = self._fft
+        n_fft = fft.fast_length(frames.shape[1] + self.max_lag + 1)
+        spectrum = fft.rfft(frames, n_fft, axis=1)
+        acf = fft.irfft(spectrum.real ** 2 + spectrum.imag ** 2, n_fft, axis=1)[:, :self.max_lag + 2]
+        
+        rows = np.arange(len(frames))
+        best = np.argmax(acf[:, self.min_lag:self.max_lag + 1], axis=1) + self.min_lag
+        peak = acf[rows, best]
+        zero_lag = acf[:, 0]
+        voiced = (zero_lag > 0) & (peak > voicing_threshold * zero_lag)
+        
+        # Parabolic interpolation around the peak for sub-sample periods
+        before = acf[rows, best - 1]
+        after = acf[rows, best + 1]
+        curvature = before - 2 * peak + after
+        with np.errstate(divide='ignore', invalid='ignore'):
+            offset = np.where(curvature < 0, 0.5 * (before - after) / curvature, 0.0)
+        periods = best.astype(acf.dtype) + np.clip(offset, -0.5, 0.5)
+        return np.where(voiced, periods, 0), voiced
+
+    @property
+    def f0(self) -> np.ndarray:
+        """Fundamental frequency (Hz) per frame, 0 for unvoiced frames"""
+        with np.errstate(divide='ignore'):
+            return np.where(self.voiced, self.sample_rate / self.periods, 0.0)
+
+    @property
+    def voiced_periods(self) -> np.ndarray:
+        """Pitch periods (samples) of voiced frames only"""
+        return self.periods[self.voiced]
+
+    def subset(self, start: int, stop: int) -> 'PitchTrack':
+        """Track of frames [start, stop)"""
+        part = copy.copy(self)
+        part.periods = self.periods[start:stop]
+        part.voiced = self.voiced[start:stop]
+        return part
+
+
+class MelCepstrum:
+    """
+    Per-frame MFCCs (STFT -> mel filterbank -> log -> DCT) over a shared
+    FrameAnalysis, so any feature can reuse them without recomputation
+    """
+
+    def __init__(
+        self,
+        frames: FrameAnalysis,
+        sample_rate: int,
+        n_mels: int = 40,
+        n_mfcc: int = 13,
+        fft: FFTService = default_fft
+    ):
+        self.sample_rate = sample_rate
+        self.n_mels = n_mels
+        self.n_mfcc = n_mfcc
+        
+        dtype = frames.frames.dtype
+        n_fft = fft.fast_length(frames.frame_length)
+        filterbank, dct = _mfcc_matrices(sample_rate, n_fft, n_mels, n_mfcc, dtype)
+        
+        window = fft.window(frames.frame_length, dtype)
+        self.n_fft = n_fft
+        self.log_mel = np.empty((frames.n_frames, n_mels), dtype=dtype)
+        # Power spectrum summed over frames (long-term average spectrum when divided by n_frames)
+        self.power_sum = np.zeros(n_fft // 2 + 1, dtype=np.float64)
+        
+        # Batched over blocks of frames so STFT temporaries stay bounded on long clips
+        for start in range(0, frames.n_frames, FRAME_BLOCK):
+            stop = min(start + FRAME_BLOCK, frames.n_frames)
+            spectrum = fft.rfft(frames.frames[start:stop] * window, n_fft, axis=1)
+            power = spectrum.real ** 2 + spectrum.imag ** 2
+            self.log_mel[start:stop] = np.log(power @ filterbank.T + 1e-10)
+            self.power_sum += power.sum(axis=0)
+        
+        # (n_frames, n_mfcc) coefficient matrix
+        self.coefficients = self.log_mel @ dct.T
+
+    def subset(self, start: int, stop: int) -> 'MelCepstrum':
+        """Coefficients of frames [start, stop)"""
+        part = copy.copy(self)
+        part.log_mel = self.log_mel[start:stop]
+        part.coefficients = self.coefficients[start:stop]
+        return part
+
+
+class AnalysisNode(NamedTuple):
+    """A named computation in the feature graph and the nodes it depends on"""
+    name: str
+    requires: Tuple[str, ...]
+    compute: Callable
+    cost: float = 0.0  # Rough relative cost, used to order early-exit scoring
+
+
+# Shared intermediates (spectrum, frames, ...) and scalar features, in registration order.
+# Every compute callable receives the detector followed by its resolved dependencies;
+# the graph roots "audio" and "sample_rate" are always available.
+ANALYSES: Dict[str, AnalysisNode] = {}
+FEATURES: Dict[str, AnalysisNode] = {}
+
+
+def register_analysis(
+    name: str,
+    requires: Sequence[str] = ("audio", "sample_rate"),
+    cost: float = 1.0
+) -> Callable:
+    """Decorator registering a shared intermediate analysis under name"""
+    def decorator(compute: Callable) -> Callable:
+        ANALYSES[name] = AnalysisNode(name, tuple(requires), compute, cost)
+        return compute
+    return decorator
+
+
+def register_feature(name: str, requires: Sequence[str] = ("audio",), cost: float = 0.0) -> Callable:
+    """
+    Decorator registering a scalar feature under name
+
+    Third-party features can register here without editing VoiceDetector;
+    they are computed lazily and reported in detailed_analysis.
+    """
+    def decorator(compute: Callable) -> Callable:
+        FEATURES[name] = AnalysisNode(name, tuple(requires), compute, cost)
+        return compute
+    return decorator
+
+
+@register_analysis("spectrum", cost=5.0)
+def _spectrum_analysis(detector: "VoiceDetector", audio_data: np.ndarray, sample_rate: int) -> SpectralAnalysis:
+    return SpectralAnalysis(audio_data, sample_rate, detector.fft)
+
+
+@register_analysis("autocorrelation", cost=10.0)
+def _autocorrelation_analysis(detector: "VoiceDetector", audio_data: np.ndarray, sample_rate: int) -> AutocorrelationAnalysis:
+    return AutocorrelationAnalysis(audio_data, sample_rate, detector.pitch_range, detector.fft)
+
+
+@register_analysis("frames", requires=("audio",), cost=1.0)
+def _frame_analysis(detector: "VoiceDetector", audio_data: np.ndarray) -> FrameAnalysis:
+    return FrameAnalysis(audio_data, detector.frame_length, detector.hop_length)
+
+
+@register_analysis("mfcc", requires=("frames", "sample_rate"), cost=3.0)
+def _mfcc_analysis(detector: "VoiceDetector", frames: FrameAnalysis, sample_rate: int) -> MelCepstrum:
+    return MelCepstrum(frames, sample_rate, detector.n_mels, detector.n_mfcc, detector.fft)
+
+
+@register_analysis("pitch", requires=("frames", "sample_rate"), cost=8.0)
+def _pitch_analysis(detector: "VoiceDetector", frames: FrameAnalysis, sample_rate: int) -> PitchTrack:
+    return PitchTrack(frames, sample_rate, detector.pitch_range, fft=detector.fft)
+
+
+class AnalysisContext:
+    """
+    Per-request evaluation of the feature graph: every node is computed
+    on first request and memoized, so unused intermediates are never built
+    """
+
+    def __init__(self, detector: "VoiceDetector", audio_data: np.ndarray, sample_rate: int, **precomputed):
+        self.detector = detector
+        self._values = {"audio": audio_data, "sample_rate": sample_rate, **precomputed}
+
+    def get(self, name: str):
+        """Value of a node, computing it and its dependencies if needed"""
+        if name not in self._values:
+            node = ANALYSES.get(name) or FEATURES.get(name)
+            if node is None:
+                raise KeyError(f"Unknown analysis or feature: {name}")
+            args = [self.get(dependency) for dependency in node.requires]
+            self._values[name] = node.compute(self.detector, *args)
+        return self._values[name]
+
+    def is_computed(self, name: str) -> bool:
+        """Whether a node has already been evaluated"""
+        return name in self._values
+
+
+def _dependencies(names: Sequence[str]) -> set:
+    """All graph nodes (transitively) required by the given nodes"""
+    required = set()
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name in required:
+            continue
+        required.add(name)
+        node = ANALYSES.get(name) or FEATURES.get(name)
+        if node is not None:
+            pending.extend(node.requires)
+    return required
+
+
+def _graph_cost(name: str) -> float:
+    """Declared cost of a node including everything it depends on"""
+    nodes = (ANALYSES.get(dependency) or FEATURES.get(dependency) for dependency in _dependencies([name]))
+    return sum(node.cost for node in nodes if node is not None)
+
+
+class StreamingAnalysis:
+    """
+    Mergeable accumulators that compute the built-in features block by
+    block, so recordings of any length are analysed in flat memory
+
+    Frame-wise statistics, the pitch track, MFCC moments, the signal-level
+    statistics and the pitch-range autocorrelation match whole-clip
+    analysis: frames that straddle a block boundary are carried over, and
+    the last max_lag samples are kept for the autocorrelation. The spectral
+    features are the exception: a whole-clip FFT cannot be streamed, so
+    they are taken from the long-term average frame spectrum instead. They
+    differ noticeably from the whole-clip values (e.g. a lower centroid and
+    flatness), and the detection thresholds have only been validated
+    against whole-clip spectral features.
+    """
+
+    def __init__(self, detector: "VoiceDetector", sample_rate: int):
+        self.detector = detector
+        self.sample_rate = sample_rate
+        dtype = detector.dtype
+        pitch_floor, pitch_ceiling = detector.pitch_range
+        self.min_lag = max(1, int(sample_rate / pitch_ceiling))
+        self.max_lag = int(np.ceil(sample_rate / pitch_floor))
+
+        # Samples carried between blocks: the start of the next frame, and the autocorrelation tail
+        self._pending = np.empty(0, dtype=dtype)
+        self._tail = np.empty(0, dtype=dtype)
+        self._last_sign = None
+
+        # Signal-level accumulators
+        self.n_samples = 0
+        self.moments = np.zeros(4)  # Sums of x, x^2, x^3, x^4
+        self.max_amplitude = 0.0
+        self.crossings = 0.0
+        self.autocorr = np.zeros(self.max_lag + 1)
+
+        # Frame-level accumulators
+        self.n_frames = 0
+        self.zcr_sums = np.zeros(2)  # Sum and sum of squares of per-frame ZCR
+        self.rms_sums = np.zeros(2)
+        self.energy_sum = 0.0
+        self.energy_log_sum = 0.0  # Sum of e * log(e) over frame energies
+        self.mfcc_sums = np.zeros((2, detector.n_mfcc - 1))  # c1.. sums and sums of squares
+        self.power_sum = None
+        self.n_fft = None
+
+        # Pitch accumulators (jitter over consecutive voiced frames)
+        self.period_sum = 0.0
+        self.n_voiced = 0
+        self.period_change_sum = 0.0
+        self.n_period_pairs = 0
+        self._last_period = 0.0  # 0 when the last frame was unvoiced
+
+    def update(self, block: np.ndarray):
+        """Feed the next block of (preprocessed, mono) samples"""
+        block = np.asarray(block, dtype=self.detector.dtype)
+        if not len(block):
+            return
+        self._update_signal(block)
+        self._update_autocorrelation(block)
+
+        # Frame the carried-over samples plus this block; frames that do not fit yet
+        # start the next buffer, so the frame sequence equals whole-clip framing
+        buffer = np.concatenate([self._pending, block])
+        frames = FrameAnalysis(buffer, self.detector.frame_length, self.detector.hop_length)
+        self._update_frames(frames)
+        self._pending = buffer[frames.n_frames * frames.hop_length:].copy()
+
+    def merge(self, other: "StreamingAnalysis") -> "StreamingAnalysis":
+        """
+        Fold in the accumulators of the segment that directly follows this one
+
+        Frames, autocorrelation lags and pitch pairs spanning the boundary
+        between the two segments are not counted.
+        """
+        self.n_samples += other.n_samples
+        self.moments += other.moments
+        self.max_amplitude = max(self.max_amplitude, other.max_amplitude)
+        self.crossings += other.crossings
+        self.autocorr += other.autocorr
+
+        self.n_frames += other.n_frames
+        self.zcr_sums += other.zcr_sums
+        self.rms_sums += other.rms_sums
+        self.energy_sum += other.energy_sum
+        self.energy_log_sum += other.energy_log_sum
+        self.mfcc_sums += other.mfcc_sums
+        if other.power_sum is not None:
+            self.power_sum = other.power_sum.copy() if self.power_sum is None else self.power_sum + other.power_sum
+            self.n_fft = other.n_fft
+
+        self.period_sum += other.period_sum
+        self.n_voiced += other.n_voiced
+        self.period_change_sum += other.period_change_sum
+        self.n_period_pairs += other.n_period_pairs
+
+        self._pending = other._pending
+        self._tail = other._tail
+        self._last_sign = other._last_sign
+        self._last_period = other._last_period
+        return self
+
+    def _update_signal(self, block: np.ndarray):
+        """Moments, peak and zero crossings of the raw samples"""
+        x = block.astype(np.float64)
+        x2 = x * x
+        self.moments += (x.sum(), x2.sum(), (x2 * x).sum(), (x2 * x2).sum())
+        self.max_amplitude = max(self.max_amplitude, float(np.max(np.abs(x))))
+
+        signs = np.sign(x)
+        self.crossings += np.sum(np.abs(np.diff(signs))) / 2
+        if self._last_sign is not None:
+            self.crossings += abs(signs[0] - self._last_sign) / 2
+        self._last_sign = signs[-1]
+        self.n_samples += len(block)
+
+    def _update_autocorrelation(self, block: np.ndarray):
+        """Add sum(x[n] * x[n - k]) over the block's samples n for lags k <= max_lag"""
+        fft = self.detector.fft
+        extended = np.concatenate([self._tail, block])
+        block_only = np.zeros_like(extended)
+        block_only[len(self._tail):] = block
+
+        # Cross-correlation of the block against itself plus the previous tail
+        n_fft = fft.fast_length(len(extended) + self.max_lag)
+        cross = fft.rfft(block_only, n_fft) * np.conj(fft.rfft(extended, n_fft))
+        self.autocorr += fft.irfft(cross, n_fft)[:self.max_lag + 1]
+        self._tail = extended[-self.max_lag:].copy() if self.max_lag else extended[:0]
+
+    def _update_frames(self, frames: FrameAnalysis):
+        """Per-frame statistics, MFCC moments and pitch pairs of complete frames"""
+        if frames.n_frames == 0:
+            return
+        detector = self.detector
+
+        zcr = frames.zcr.astype(np.float64)
+        rms = frames.rms.astype(np.float64)
+        energy = frames.energy.astype(np.float64)
+        self.zcr_sums += (zcr.sum(), np.dot(zcr, zcr))
+        self.rms_sums += (rms.sum(), np.dot(rms, rms))
+        self.energy_sum += energy.sum()
+        positive = energy[energy > 0]
+        self.energy_log_sum += np.dot(positive, np.log(positive))
+
+        mfcc = MelCepstrum(frames, self.sample_rate, detector.n_mels, detector.n_mfcc, detector.fft)
+        coefficients = mfcc.coefficients[:, 1:].astype(np.float64)
+        self.mfcc_sums += (coefficients.sum(axis=0), (coefficients * coefficients).sum(axis=0))
+        self.power_sum = mfcc.power_sum if self.power_sum is None else self.power_sum + mfcc.power_sum
+        self.n_fft = mfcc.n_fft
+
+        pitch = PitchTrack(frames, self.sample_rate, detector.pitch_range, fft=detector.fft)
+        periods = np.concatenate([[self._last_period], pitch.periods.astype(np.float64)])
+        voiced = periods > 0
+        both_voiced = voiced[1:] & voiced[:-1]
+        self.period_sum += periods[1:][voiced[1:]].sum()
+        self.n_voiced += int(np.count_nonzero(voiced[1:]))
+        self.period_change_sum += np.abs(np.diff(periods))[both_voiced].sum()
+        self.n_period_pairs += int(np.count_nonzero(both_voiced))
+        self._last_period = periods[-1]
+
+        self.n_frames += frames.n_frames
+
+    def features(self) -> Dict:
+        """Built-in features of everything fed so far, under their registered names"""
+        detector = self.detector
+        n = self.n_samples
+        features = {}
+
+        if self.power_sum is not None:
+            magnitude = np.sqrt(self.power_sum / self.n_frames).astype(detector.dtype)
+            spectrum = SpectralAnalysis.from_magnitude(magnitude, self.n_fft, self.sample_rate)
+        else:
+            spectrum = SpectralAnalysis(np.zeros(1, dtype=detector.dtype), self.sample_rate, detector.fft)
+        features["spectral_flatness"] = detector._calculate_spectral_flatness(spectrum)
+        features["spectral_centroid"] = detector._calculate_spectral_centroid(spectrum)
+        features["spectral_rolloff"] = detector._calculate_spectral_rolloff(spectrum)
+
+        max_lag = max(0, min(n - 1, self.max_lag))
+        autocorr = AutocorrelationAnalysis.from_values(self.autocorr[:max_lag + 1], self.sample_rate, self.min_lag)
+        features["harmonic_ratio"] = detector._calculate_harmonic_ratio(autocorr)
+        features["zero_crossing_rate"] = float(self.crossings / n) if n else 0.0
+
+        n_frames = self.n_frames
+        if n_frames:
+            zcr_mean = self.zcr_sums[0] / n_frames
+            features["zcr_std"] = float(np.sqrt(max(self.zcr_sums[1] / n_frames - zcr_mean ** 2, 0.0)))
+        else:
+            features["zcr_std"] = 0.0
+
+        if self.n_period_pairs:
+            jitter = (self.period_change_sum / self.n_period_pairs) / (self.period_sum / self.n_voiced + 1e-10)
+            features["jitter"] = float(min(jitter, 1.0))
+        else:
+            features["jitter"] = 0.01
+
+        if n_frames > 1:
+            rms_mean = self.rms_sums[0] / n_frames
+            rms_std = np.sqrt(max(self.rms_sums[1] / n_frames - rms_mean ** 2, 0.0))
+            features["shimmer"] = float(min(rms_std / (rms_mean + 1e-10), 1.0))
+        else:
+            features["shimmer"] = 0.05
+
+        if n_frames > 1:
+            mfcc_mean = self.mfcc_sums[0] / n_frames
+            features["mfcc_variance"] = float(np.mean(np.maximum(self.mfcc_sums[1] / n_frames - mfcc_mean ** 2, 0.0)))
+        else:
+            features["mfcc_variance"] = 0.0
+
+        # H = -sum(p log p) with p = e / E, rewritten as log E - sum(e log e) / E
+        if n_frames and self.energy_sum > 0:
+            features["energy_entropy"] = float(np.log(self.energy_sum) - self.energy_log_sum / self.energy_sum)
+        else:
+            features["energy_entropy"] = float(np.log(n_frames)) if n_frames else 0.0
+
+        rms = np.sqrt(self.moments[1] / n) if n else 0.0
+        features["dynamic_range"] = float(20 * np.log10(self.max_amplitude / (rms + 1e-10))) if rms > 0 else 0.0
+
+        # Central moments from raw power sums (biased, as scipy.stats computes them)
+        mean, second, third, fourth = self.moments / n if n else np.zeros(4)
+        m2 = second - mean ** 2
+        m3 = third - 3 * mean * second + 2 * mean ** 3
+        m4 = fourth - 4 * mean * third + 6 * mean ** 2 * second - 3 * mean ** 4
+        with np.errstate(divide='ignore', invalid='ignore'):
+            features["signal_kurtosis"] = float(np.float64(m4) / m2 ** 2 - 3.0)
+            features["signal_skewness"] = float(np.float64(m3) / m2 ** 1.5)
+
+        return features
+
+
 class VoiceDetector:
     """Main class for voice detection analysis"""
     
-    def __init__(self):
-        """Initialize the voice detector with default thresholds"""
+    # Features read by scoring and the explanation; the rest are only
+    # computed when detailed features are requested
+    scoring_features = (
+        "spectral_flatness",
+        "harmonic_ratio",
+        "zcr_std",
+        "jitter",
+        "shimmer",
+        "mfcc_variance",
+        "energy_entropy",
+    )
+    
+    def __init__(
+        self,
+        pitch_range: Tuple[float, float] = (50.0, 500.0),
+        frame_length: int = 1024,
+        hop_length: int = 512,
+        n_mels: int = 40,
+        n_mfcc: int = 13,
+        precision: str = "float32",
+        fft_workers: Optional[int] = None,
+        analysis_budget: Optional[float] = 30.0,
+        analysis_segments: int = 6
+    ):
+        """
+        Initialize the voice detector with default thresholds
+        
+        Precision mode: with "float32" (default) every stage of feature
+        extraction stays in float32/complex64 - input audio, spectra,
+        frames, autocorrelations, MFCCs and the pitch track - halving
+        memory against float64. Audio in another dtype is converted once
+        on entry. "float64" keeps double precision throughout instead.
+        
+        Analysis budget: clips longer than analysis_budget seconds are
+        analysed through analysis_segments representative segments spread
+        across the recording, totalling the budget (None = always analyse
+        the whole clip). Results report the coverage.
+        """
+        if precision not in ("float32", "float64"):
+            raise ValueError(f"Unsupported precision: {precision} (use 'float32' or 'float64')")
+        self.dtype = np.dtype(precision)
+        
+        # All transforms go through one FFT service (fast lengths, worker threads, cached axes)
+        self.fft = FFTService(workers=fft_workers)
+        
+        # Fundamental frequency search range in Hz (bounds autocorrelation lags)
+        self.pitch_range = pitch_range
+        
+        # Framing used by all frame-based features
+        self.frame_length = frame_length
+        self.hop_length = hop_length
+        
+        # Mel-cepstral analysis settings
+        self.n_mels = n_mels
+        self.n_mfcc = n_mfcc
+        
+        # Time budget for long clips (seconds analysed, split across segments)
+        self.analysis_budget = analysis_budget
+        self.analysis_segments = analysis_segments
+        
         self.thresholds = {
             # AI-generated voices often have these characteristics:
             "spectral_flatness_threshold": 0.15,  # More uniform spectrum
@@ -41,7 +761,8 @@ class VoiceDetector:
         audio_data: np.ndarray, 
         sample_rate: int, 
         language: str,
-        include_features: bool = False
+        include_features: bool = False,
+        full_analysis: bool = False
     ) -> Dict:
         """
         Main detection method
@@ -51,17 +772,278 @@ class VoiceDetector:
             sample_rate: Sample rate of the audio
             language: Language of the speech
             include_features: Whether to include detailed features
+            full_analysis: Analyse the whole clip even if it exceeds the analysis budget
             
         Returns:
             Dictionary with classification, confidence, and explanation
         """
         logger.info(f"Starting detection for {language} audio")
+        audio_data = np.asarray(audio_data, dtype=self.dtype)
+        total_samples = len(audio_data)
+        if not full_analysis:
+            audio_data, _ = self.sample_segments(audio_data, sample_rate)
+        
+        if include_features:
+            features = self._extract_features(audio_data, sample_rate, language, list(FEATURES))
+            result = self._build_result(features, language, include_features)
+        else:
+            # Only the verdict is needed: stop extracting once it can no longer flip
+            context = AnalysisContext(self, audio_data, sample_rate)
+            result = self._detect_early_exit(context, language)
+        
+        return self._add_coverage(result, len(audio_data), total_samples, sample_rate)
+    
+    def sample_segments(self, audio_data: np.ndarray, sample_rate: int) -> Tuple[np.ndarray, float]:
+        """
+        Representative segments of a clip longer than the analysis budget
+        
+        The clip is split into analysis_segments equal regions and one
+        hop-aligned window of budget / analysis_segments seconds is taken
+        from each. Within a region the window whose energy is closest to the
+        region's 75th-percentile window energy is chosen: it holds active
+        speech but is not an outlier burst. The windows are concatenated, so
+        frame statistics are pooled across segments.
+        
+        Returns:
+            Tuple of (analysed_audio, coverage), where coverage is the
+            fraction of the clip's samples that are analysed
+        """
+        n_samples = len(audio_data)
+        if self.analysis_budget is None or n_samples <= self.analysis_budget * sample_rate:
+            return audio_data, 1.0
+        
+        hop = self.hop_length
+        n_segments = max(1, self.analysis_segments)
+        window_hops = max(1, int(self.analysis_budget * sample_rate / n_segments) // hop)
+        
+        # Energy per hop-sized chunk; window energies are differences of its running sum
+        n_hops = n_samples // hop
+        chunks = audio_data[:n_hops * hop].reshape(n_hops, hop)
+        cumulative = np.concatenate([[0.0], np.cumsum(np.einsum('ij,ij->i', chunks, chunks), dtype=np.float64)])
+        
+        region_hops = n_hops // n_segments
+        segments = []
+        for index in range(n_segments):
+            first = index * region_hops
+            last = max(first, first + region_hops - window_hops)
+            starts = np.arange(first, last + 1)
+            energies = cumulative[starts + window_hops] - cumulative[starts]
+            target = np.percentile(energies, 75)
+            start = int(starts[np.argmin(np.abs(energies - target))]) * hop
+            segments.append(audio_data[start:start + window_hops * hop])
+        
+        sampled = np.concatenate(segments)
+        coverage = len(sampled) / n_samples
+        logger.info(f"Analysis budget: {len(segments)} segments, {coverage:.1%} of {n_samples / sample_rate:.1f}s")
+        return sampled, coverage
+    
+    @staticmethod
+    def _add_coverage(result: Dict, analyzed_samples: int, total_samples: int, sample_rate: int) -> Dict:
+        """Report how much of the clip the result is based on"""
+        result["analyzed_duration_seconds"] = round(analyzed_samples / sample_rate, 2)
+        result["coverage"] = round(analyzed_samples / total_samples, 4) if total_samples else 1.0
+        return result
+    
+    def detect_many(
+        self,
+        audio_clips: Sequence[np.ndarray],
+        sample_rate: int,
+        languages: Union[str, Sequence[str]],
+        include_features: bool = False,
+        full_analysis: Union[bool, Sequence[bool]] = False
+    ) -> List[Dict]:
+        """
+        Batched detection over several clips
+        
+        All clips are packed into one hop-aligned buffer so the frame-based
+        analysis (energy, ZCR, MFCC, pitch) runs as a single set of array
+        operations; whole-signal features are still computed per clip.
+        
+        Args:
+            audio_clips: Audio signals as numpy arrays
+            sample_rate: Sample rate shared by all clips
+            languages: One language per clip, or a single language for all
+            include_features: Whether to include detailed features
+            full_analysis: Per clip (or for all), analyse the whole clip
+                even if it exceeds the analysis budget
+            
+        Returns:
+            List of results, one per clip, identical to calling detect() on each
+        """
+        if isinstance(languages, str):
+            languages = [languages] * len(audio_clips)
+        if len(languages) != len(audio_clips):
+            raise ValueError("languages must have one entry per audio clip")
+        if isinstance(full_analysis, bool):
+            full_analysis = [full_analysis] * len(audio_clips)
+        if len(full_analysis) != len(audio_clips):
+            raise ValueError("full_analysis must have one entry per audio clip")
+        if not audio_clips:
+            return []
+        
+        logger.info(f"Starting batched detection for {len(audio_clips)} clips")
+        audio_clips = [np.asarray(clip, dtype=self.dtype) for clip in audio_clips]
+        total_samples = [len(clip) for clip in audio_clips]
+        audio_clips = [
+            clip if full else self.sample_segments(clip, sample_rate)[0]
+            for clip, full in zip(audio_clips, full_analysis)
+        ]
+        
+        # Place each clip on a hop boundary so packed frame k of a clip is its own frame k
+        hop = self.hop_length
+        offsets = []
+        position = 0
+        for clip in audio_clips:
+            offsets.append(position)
+            position += -(-len(clip) // hop) * hop
+        
+        packed = np.zeros(position + self.frame_length + hop, dtype=self.dtype)
+        for clip, offset in zip(audio_clips, offsets):
+            packed[offset:offset + len(clip)] = clip
+        
+        # Frame-based intermediates, built once for the batch. Without detailed features
+        # only the cheap frame view is shared, so early exit can still skip MFCC and pitch.
+        feature_names = list(FEATURES) if include_features else self.scoring_features
+        shared_names = ("frames", "mfcc", "pitch") if include_features else ("frames",)
+        required = _dependencies(feature_names)
+        packed_context = AnalysisContext(self, packed, sample_rate)
+        shared = {name: packed_context.get(name) for name in shared_names if name in required}
+        
+        if "frames" in shared:
+            # Run the lazy per-frame reductions once over the whole batch before splitting
+            _ = shared["frames"].energy, shared["frames"].zcr
+        
+        results = []
+        for clip, offset, language, total in zip(audio_clips, offsets, languages, total_samples):
+            start = offset // hop
+            stop = start + len(range(0, len(clip) - self.frame_length, hop))
+            precomputed = {}
+            for name, analysis in shared.items():
+                if name == "frames":
+                    precomputed[name] = analysis.subset(clip, start, stop)
+                else:
+                    precomputed[name] = analysis.subset(start, stop)
+            
+            if include_features:
+                features = self._extract_features(clip, sample_rate, language, feature_names, precomputed)
+                result = self._build_result(features, language, include_features)
+            else:
+                context = AnalysisContext(self, clip, sample_rate, **precomputed)
+                result = self._detect_early_exit(context, language)
+            results.append(self._add_coverage(result, len(clip), total, sample_rate))
+        
+        return results
+
+    def detect_stream(
+        self,
+        blocks: Iterable[np.ndarray],
+        sample_rate: int,
+        language: str,
+        include_features: bool = False
+    ) -> Dict:
+        """
+        Detection over a stream of consecutive audio blocks
+
+        Blocks are consumed one at a time by StreamingAnalysis, so memory
+        stays flat however long the recording is. Only the built-in
+        features are available in streaming mode. The spectral features
+        come from the average frame spectrum, which the thresholds have not
+        been re-validated against, so results for the same clip can differ
+        from detect. The API does not use this path.
+
+        Args:
+            blocks: Iterable of 1-D audio blocks (e.g. AudioProcessor.stream_audio)
+            sample_rate: Sample rate of the audio
+            language: Language of the speech
+            include_features: Whether to include detailed features
+
+        Returns:
+            Dictionary with classification, confidence, and explanation
+        """
+        logger.info(f"Starting streaming detection for {language} audio")
+        analysis = StreamingAnalysis(self, sample_rate)
+        for block in blocks:
+            analysis.update(block)
+
+        if analysis.n_samples == 0:
+            raise ValueError("Audio stream is empty")
+
+        result = self._build_result(analysis.features(), language, include_features)
+        return self._add_coverage(result, analysis.n_samples, analysis.n_samples, sample_rate)
+
+    def extract_features(self, audio_data: np.ndarray, sample_rate: int) -> Dict:
+        """
+        Every registered feature of a clip
+
+        Features do not depend on thresholds or language weights, so they
+        can be stored and re-scored later with detect_from_features.
+        """
+        audio_data = np.asarray(audio_data, dtype=self.dtype)
+        return self._extract_features(audio_data, sample_rate, None, list(FEATURES))
+
+    def detect_from_features(self, features: Dict, language: str, include_features: bool = False) -> Dict:
+        """
+        Score already extracted features, skipping decoding and extraction
         
-        # Extract features
-        features = self._extract_features(audio_data, sample_rate, language)
+        Without detailed features the same early-exit rule as detect() is
+        applied, so a stored clip gets exactly the result it would get when
+        detected from its audio.
+        """
+        if not include_features:
+            return self._score_early_exit(features.__getitem__, language)
+        return self._build_result(features, language, include_features)
+
+    def _detect_early_exit(self, context: AnalysisContext, language: str) -> Dict:
+        """Detect with early exit, computing each feature only when it is scored"""
+        return self._score_early_exit(context.get, language)
+    
+    def _score_early_exit(self, get_feature: Callable[[str], float], language: str) -> Dict:
+        """
+        Score features cheapest-first and stop once the remaining weight
+        can no longer move the AI probability across 0.5
         
+        When scoring stops early the probability is the midpoint of the still
+        reachable range, which always falls on the side of the final verdict;
+        the result is then flagged with confidence_is_estimate.
+        """
+        rules = self._scoring_rules(language)
+        total_weight = sum(weight for _, weight, _ in rules)
+        remaining_weight = total_weight
+        ai_score = 0.0
+        features = {}
+        
+        # Static order (by declared graph cost) keeps results independent of what is cached
+        ordered = sorted(rules, key=lambda rule: _graph_cost(rule[0]))
+        for name, weight, is_ai_like in ordered:
+            if ai_score > total_weight / 2 or ai_score + remaining_weight <= total_weight / 2:
+                break
+            features[name] = get_feature(name)
+            if is_ai_like(features[name]):
+                ai_score += weight
+            remaining_weight -= weight
+        
+        skipped = [name for name, _, _ in ordered if name not in features]
+        if skipped:
+            logger.info(f"Early exit: skipped {', '.join(skipped)}")
+        
+        ai_probability = (ai_score + remaining_weight / 2) / total_weight if total_weight > 0 else 0.5
+        
+        result = self._build_result(features, language, False, ai_probability)
+        result["skipped_features"] = skipped
+        result["confidence_is_estimate"] = bool(skipped)
+        return result
+    
+    def _build_result(
+        self,
+        features: Dict,
+        language: str,
+        include_features: bool,
+        ai_probability: Optional[float] = None
+    ) -> Dict:
+        """Score extracted features and assemble the detection result"""
         # Calculate AI probability based on features
-        ai_probability = self._calculate_ai_probability(features, language)
+        if ai_probability is None:
+            ai_probability = self._calculate_ai_probability(features, language)
         
         # Determine classification
         classification = "ai_generated" if ai_probability > 0.5 else "human_generated"
@@ -73,6 +1055,7 @@ class VoiceDetector:
         result = {
             "classification": classification,
             "confidence_score": round(confidence_score, 4),
+            "confidence_is_estimate": False,
             "explanation": explanation
         }
         
@@ -85,195 +1068,160 @@ class VoiceDetector:
         
         return result
     
-    def _extract_features(self, audio_data: np.ndarray, sample_rate: int, language: str) -> Dict:
-        """Extract audio features for analysis"""
-        features = {}
-        
-        # 1. Spectral Features
-        features['spectral_flatness'] = self._calculate_spectral_flatness(audio_data)
-        features['spectral_centroid'] = self._calculate_spectral_centroid(audio_data, sample_rate)
-        features['spectral_rolloff'] = self._calculate_spectral_rolloff(audio_data, sample_rate)
-        
-        # 2. Harmonic Features
-        features['harmonic_ratio'] = self._calculate_harmonic_ratio(audio_data)
-        
-        # 3. Temporal Features
-        features['zero_crossing_rate'] = self._calculate_zero_crossing_rate(audio_data)
-        features['zcr_std'] = self._calculate_zcr_std(audio_data)
-        
-        # 4. Prosodic Features (pitch variation)
-        features['jitter'] = self._calculate_jitter(audio_data, sample_rate)
-        features['shimmer'] = self._calculate_shimmer(audio_data)
-        
-        # 5. Mel-Frequency Cepstral Coefficients
-        features['mfcc_variance'] = self._calculate_mfcc_variance(audio_data, sample_rate)
-        
-        # 6. Energy and Dynamics
-        features['energy_entropy'] = self._calculate_energy_entropy(audio_data)
-        features['dynamic_range'] = self._calculate_dynamic_range(audio_data)
+    def _extract_features(
+        self,
+        audio_data: np.ndarray,
+        sample_rate: int,
+        language: str,
+        feature_names: Optional[Sequence[str]] = None,
+        precomputed: Optional[Dict] = None
+    ) -> Dict:
+        """
+        Extract audio features for analysis
         
-        # 7. Statistical Features
-        features['signal_kurtosis'] = kurtosis(audio_data)
-        features['signal_skewness'] = skew(audio_data)
+        Args:
+            audio_data: Audio signal as numpy array
+            sample_rate: Sample rate of the audio
+            language: Language of the speech
+            feature_names: Features to compute (default: every registered feature)
+            precomputed: Already-built intermediates, keyed by analysis name
+            
+        Returns:
+            Dictionary of feature name to value
+        """
+        if feature_names is None:
+            feature_names = list(FEATURES)
         
-        return features
+        context = AnalysisContext(self, audio_data, sample_rate, **(precomputed or {}))
+        return {name: context.get(name) for name in feature_names}
     
-    def _calculate_spectral_flatness(self, audio_data: np.ndarray) -> float:
+    @register_feature("spectral_flatness", requires=("spectrum",))
+    def _calculate_spectral_flatness(self, spectrum: SpectralAnalysis) -> float:
         """
         Calculate spectral flatness (Wiener entropy)
         AI voices tend to have flatter spectra (higher values)
         """
-        spectrum = np.abs(fft(audio_data))
-        spectrum = spectrum[:len(spectrum)//2]  # Take positive frequencies
-        
-        geometric_mean = np.exp(np.mean(np.log(spectrum + 1e-10)))
-        arithmetic_mean = np.mean(spectrum)
+        geometric_mean = np.exp(np.mean(spectrum.log_magnitude))
+        arithmetic_mean = np.mean(spectrum.magnitude)
         
         flatness = geometric_mean / (arithmetic_mean + 1e-10)
         return float(flatness)
     
-    def _calculate_spectral_centroid(self, audio_data: np.ndarray, sample_rate: int) -> float:
+    @register_feature("spectral_centroid", requires=("spectrum",))
+    def _calculate_spectral_centroid(self, spectrum: SpectralAnalysis) -> float:
         """Calculate spectral centroid (brightness of sound)"""
-        spectrum = np.abs(fft(audio_data))
-        freqs = np.fft.fftfreq(len(audio_data), 1/sample_rate)
-        freqs = freqs[:len(freqs)//2]
-        spectrum = spectrum[:len(spectrum)//2]
-        
-        centroid = np.sum(freqs * spectrum) / (np.sum(spectrum) + 1e-10)
+        magnitude = spectrum.magnitude
+        # Mean bin index scaled to Hz, without materialising the frequency axis
+        bins = np.arange(len(magnitude), dtype=magnitude.dtype)
+        centroid = np.dot(bins, magnitude) * spectrum.sample_rate / spectrum.n_fft / (np.sum(magnitude) + 1e-10)
         return float(centroid)
     
-    def _calculate_spectral_rolloff(self, audio_data: np.ndarray, sample_rate: int) -> float:
+    @register_feature("spectral_rolloff", requires=("spectrum",))
+    def _calculate_spectral_rolloff(self, spectrum: SpectralAnalysis) -> float:
         """Calculate spectral rolloff (85% of energy threshold)"""
-        spectrum = np.abs(fft(audio_data))
-        spectrum = spectrum[:len(spectrum)//2]
+        magnitude = spectrum.magnitude
         
-        total_energy = np.sum(spectrum)
+        total_energy = np.sum(magnitude)
         threshold = 0.85 * total_energy
         
-        cumsum = np.cumsum(spectrum)
-        rolloff_idx = np.where(cumsum >= threshold)[0]
+        cumsum = np.cumsum(magnitude)
+        rolloff_idx = np.searchsorted(cumsum, threshold)
         
-        if len(rolloff_idx) > 0:
-            rolloff_freq = rolloff_idx[0] * sample_rate / (2 * len(spectrum))
+        if len(magnitude) > 0 and rolloff_idx < len(magnitude):
+            rolloff_freq = rolloff_idx * spectrum.sample_rate / (2 * len(magnitude))
             return float(rolloff_freq)
         return 0.0
     
-    def _calculate_harmonic_ratio(self, audio_data: np.ndarray) -> float:
+    @register_feature("harmonic_ratio", requires=("autocorrelation",))
+    def _calculate_harmonic_ratio(self, autocorr: AutocorrelationAnalysis) -> float:
         """
         Calculate harmonic-to-noise ratio
         AI voices often have higher harmonic content
         """
-        # Use autocorrelation to estimate harmonicity
-        autocorr = np.correlate(audio_data, audio_data, mode='full')
-        autocorr = autocorr[len(autocorr)//2:]
+        # Use autocorrelation within the pitch range to estimate harmonicity
+        lags = autocorr.pitch_lags
         
-        if len(autocorr) < 2:
+        if len(lags) < 2:
             return 0.5
         
         # Find peaks in autocorrelation
-        peaks = signal.find_peaks(autocorr[1:], height=0)[0]
+        peaks = signal.find_peaks(lags, height=0)[0]
         
         if len(peaks) > 0:
-            harmonic_strength = np.mean(autocorr[peaks + 1]) / (np.max(autocorr) + 1e-10)
+            harmonic_strength = np.mean(lags[peaks]) / (autocorr.energy + 1e-10)
             return float(min(harmonic_strength, 1.0))
         
         return 0.3
     
+    @register_feature("zero_crossing_rate")
     def _calculate_zero_crossing_rate(self, audio_data: np.ndarray) -> float:
         """Calculate zero crossing rate"""
         zero_crossings = np.sum(np.abs(np.diff(np.sign(audio_data)))) / 2
         zcr = zero_crossings / len(audio_data)
         return float(zcr)
     
-    def _calculate_zcr_std(self, audio_data: np.ndarray) -> float:
+    @register_feature("zcr_std", requires=("frames",))
+    def _calculate_zcr_std(self, frames: FrameAnalysis) -> float:
         """
         Calculate standard deviation of ZCR across frames
         AI voices tend to have more consistent ZCR (lower std)
         """
-        frame_length = 1024
-        hop_length = 512
-        
-        zcr_values = []
-        for i in range(0, len(audio_data) - frame_length, hop_length):
-            frame = audio_data[i:i+frame_length]
-            zcr = self._calculate_zero_crossing_rate(frame)
-            zcr_values.append(zcr)
-        
-        return float(np.std(zcr_values)) if zcr_values else 0.0
+        return float(np.std(frames.zcr)) if frames.n_frames else 0.0
     
-    def _calculate_jitter(self, audio_data: np.ndarray, sample_rate: int) -> float:
+    @register_feature("jitter", requires=("pitch",))
+    def _calculate_jitter(self, pitch: PitchTrack) -> float:
         """
         Calculate jitter (pitch period variation)
         AI voices tend to have lower jitter
         """
-        # Simplified jitter calculation using autocorrelation
-        autocorr = np.correlate(audio_data, audio_data, mode='full')
-        autocorr = autocorr[len(autocorr)//2:]
+        # Local jitter over consecutive voiced frames of the F0 track
+        both_voiced = pitch.voiced[1:] & pitch.voiced[:-1]
         
-        # Find pitch period
-        peaks = signal.find_peaks(autocorr[1:], height=0.3*np.max(autocorr))[0]
-        
-        if len(peaks) > 1:
-            periods = np.diff(peaks)
-            jitter = np.std(periods) / (np.mean(periods) + 1e-10)
+        if np.any(both_voiced):
+            period_changes = np.abs(np.diff(pitch.periods))[both_voiced]
+            jitter = np.mean(period_changes) / (np.mean(pitch.voiced_periods) + 1e-10)
             return float(min(jitter, 1.0))
         
         return 0.01
     
-    def _calculate_shimmer(self, audio_data: np.ndarray) -> float:
+    @register_feature("shimmer", requires=("frames",))
+    def _calculate_shimmer(self, frames: FrameAnalysis) -> float:
         """
         Calculate shimmer (amplitude variation)
         AI voices tend to have lower shimmer
         """
-        frame_length = 1024
-        hop_length = 512
-        
-        amplitudes = []
-        for i in range(0, len(audio_data) - frame_length, hop_length):
-            frame = audio_data[i:i+frame_length]
-            amplitude = np.sqrt(np.mean(frame**2))
-            amplitudes.append(amplitude)
-        
-        if len(amplitudes) > 1:
+        if frames.n_frames > 1:
+            amplitudes = frames.rms
             shimmer = np.std(amplitudes) / (np.mean(amplitudes) + 1e-10)
             return float(min(shimmer, 1.0))
         
         return 0.05
     
-    def _calculate_mfcc_variance(self, audio_data: np.ndarray, sample_rate: int) -> float:
+    @register_feature("mfcc_variance", requires=("mfcc",))
+    def _calculate_mfcc_variance(self, mfcc: MelCepstrum) -> float:
         """
         Calculate variance in MFCCs
         AI voices tend to have more uniform MFCCs (lower variance)
         """
-        # Simplified MFCC variance using spectral features
-        spectrum = np.abs(fft(audio_data))
-        spectrum = spectrum[:len(spectrum)//2]
-        
-        # Apply mel filterbank (simplified)
-        mel_spectrum = np.log(spectrum + 1e-10)
+        coefficients = mfcc.coefficients
+        if len(coefficients) < 2:
+            return 0.0
         
-        # Calculate variance
-        variance = np.var(mel_spectrum)
+        # Mean over-time variance of each coefficient, skipping c0 (overall log energy)
+        variance = np.mean(np.var(coefficients[:, 1:], axis=0))
         return float(variance)
     
-    def _calculate_energy_entropy(self, audio_data: np.ndarray) -> float:
+    @register_feature("energy_entropy", requires=("frames",))
+    def _calculate_energy_entropy(self, frames: FrameAnalysis) -> float:
         """Calculate entropy of energy distribution"""
-        frame_length = 1024
-        hop_length = 512
-        
-        energies = []
-        for i in range(0, len(audio_data) - frame_length, hop_length):
-            frame = audio_data[i:i+frame_length]
-            energy = np.sum(frame**2)
-            energies.append(energy)
-        
-        if energies:
-            energies = np.array(energies)
+        if frames.n_frames:
+            energies = frames.energy
             energies = energies / (np.sum(energies) + 1e-10)
             return float(entropy(energies + 1e-10))
         
         return 0.0
     
+    @register_feature("dynamic_range")
     def _calculate_dynamic_range(self, audio_data: np.ndarray) -> float:
         """Calculate dynamic range of the signal"""
         max_amplitude = np.max(np.abs(audio_data))
@@ -285,6 +1233,41 @@ class VoiceDetector:
         
         return 0.0
     
+    @register_feature("signal_kurtosis")
+    def _calculate_kurtosis(self, audio_data: np.ndarray) -> float:
+        """Calculate excess kurtosis of the sample distribution"""
+        return float(kurtosis(audio_data))
+    
+    @register_feature("signal_skewness")
+    def _calculate_skewness(self, audio_data: np.ndarray) -> float:
+        """Calculate skewness of the sample distribution"""
+        return float(skew(audio_data))
+    
+    def _scoring_rules(self, language: str) -> List[Tuple[str, float, Callable[[float], bool]]]:
+        """
+        Weighted scoring rules as (feature, weight, is_ai_like) tuples
+        """
+        # Language-specific weight
+        lang_weight = self.language_models.get(language, {}).get("phoneme_weight", 1.0)
+        thresholds = self.thresholds
+        
+        return [
+            # Spectral flatness (higher = more AI-like)
+            ("spectral_flatness", 2.0, lambda v: v > thresholds['spectral_flatness_threshold']),
+            # Harmonic ratio (higher = more AI-like)
+            ("harmonic_ratio", 1.5, lambda v: v > thresholds['harmonic_ratio_threshold']),
+            # ZCR standard deviation (lower = more AI-like)
+            ("zcr_std", 1.8 * lang_weight, lambda v: v < thresholds['zero_crossing_rate_std']),
+            # Jitter (lower = more AI-like)
+            ("jitter", 2.2, lambda v: v < thresholds['jitter_threshold']),
+            # Shimmer (lower = more AI-like)
+            ("shimmer", 2.0, lambda v: v < thresholds['shimmer_threshold']),
+            # MFCC variance (lower = more AI-like)
+            ("mfcc_variance", 1.5, lambda v: v < thresholds['mel_cepstral_distortion']),
+            # Energy entropy (lower = more AI-like for consistent energy)
+            ("energy_entropy", 1.0, lambda v: v < 3.5),
+        ]
+    
     def _calculate_ai_probability(self, features: Dict, language: str) -> float:
         """
         Calculate probability that the voice is AI-generated
@@ -293,43 +1276,10 @@ class VoiceDetector:
         ai_score = 0.0
         total_weight = 0.0
         
-        # Language-specific weight
-        lang_weight = self.language_models.get(language, {}).get("phoneme_weight", 1.0)
-        
-        # Spectral flatness (higher = more AI-like)
-        if features['spectral_flatness'] > self.thresholds['spectral_flatness_threshold']:
-            ai_score += 2.0
-        total_weight += 2.0
-        
-        # Harmonic ratio (higher = more AI-like)
-        if features['harmonic_ratio'] > self.thresholds['harmonic_ratio_threshold']:
-            ai_score += 1.5
-        total_weight += 1.5
-        
-        # ZCR standard deviation (lower = more AI-like)
-        if features['zcr_std'] < self.thresholds['zero_crossing_rate_std']:
-            ai_score += 1.8 * lang_weight
-        total_weight += 1.8 * lang_weight
-        
-        # Jitter (lower = more AI-like)
-        if features['jitter'] < self.thresholds['jitter_threshold']:
-            ai_score += 2.2
-        total_weight += 2.2
-        
-        # Shimmer (lower = more AI-like)
-        if features['shimmer'] < self.thresholds['shimmer_threshold']:
-            ai_score += 2.0
-        total_weight += 2.0
-        
-        # MFCC variance (lower = more AI-like)
-        if features['mfcc_variance'] < self.thresholds['mel_cepstral_distortion']:
-            ai_score += 1.5
-        total_weight += 1.5
-        
-        # Energy entropy (lower = more AI-like for consistent energy)
-        if features['energy_entropy'] < 3.5:
-            ai_score += 1.0
-        total_weight += 1.0
+        for name, weight, is_ai_like in self._scoring_rules(language):
+            if is_ai_like(features[name]):
+                ai_score += weight
+            total_weight += weight
         
         # Normalize to probability
         probability = ai_score / total_weight if total_weight > 0 else 0.5
@@ -342,22 +1292,18 @@ class VoiceDetector:
         confidence = ai_probability if ai_probability > 0.5 else (1 - ai_probability)
         
         reasons = []
-        
-        # Analyze key indicators
-        if features['spectral_flatness'] > self.thresholds['spectral_flatness_threshold']:
-            reasons.append("uniform spectral distribution")
-        
-        if features['jitter'] < self.thresholds['jitter_threshold']:
-            reasons.append("minimal pitch variation")
-        
-        if features['shimmer'] < self.thresholds['shimmer_threshold']:
-            reasons.append("consistent amplitude")
-        
-        if features['zcr_std'] < self.thresholds['zero_crossing_rate_std']:
-            reasons.append("stable zero-crossing rate")
-        
-        if features['harmonic_ratio'] > self.thresholds['harmonic_ratio_threshold']:
-            reasons.append("high harmonic content")
+        is_ai_like = {name: rule for name, _, rule in self._scoring_rules(language)}
+        
+        # Analyze key indicators (features skipped by early exit are not cited)
+        for name, reason in (
+            ("spectral_flatness", "uniform spectral distribution"),
+            ("jitter", "minimal pitch variation"),
+            ("shimmer", "consistent amplitude"),
+            ("zcr_std", "stable zero-crossing rate"),
+            ("harmonic_ratio", "high harmonic content"),
+        ):
+            if name in features and is_ai_like[name](features[name]):
+                reasons.append(reason)
         
         if not reasons:
             reasons = ["natural prosodic variation", "organic spectral characteristics"]